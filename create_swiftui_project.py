@@ -2,58 +2,53 @@
 """
 Create SwiftUI Xcode Project for iPad Rust Core
 This script creates a complete SwiftUI project with all necessary files.
+Pass --incremental to update an existing project in place, skipping files
+that are already up to date.
 """
 
+import json
 import os
 import sys
 import shutil
+import stat
+import subprocess
+import tempfile
+import threading
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 
-def create_directory_structure():
-    """Create the basic directory structure."""
-    print("🏗️ Creating directory structure...")
-    
-    # Remove old project file
-    if os.path.exists("ActionAidSwiftUI"):
-        shutil.rmtree("ActionAidSwiftUI")
-    
-    directories = [
-        "ActionAidSwiftUI",
-        "ActionAidSwiftUI/ActionAidSwiftUI.xcodeproj",
-        "ActionAidSwiftUI/ActionAidSwiftUI",
-        "ActionAidSwiftUI/ActionAidSwiftUI/Libraries",
-        "ActionAidSwiftUI/ActionAidSwiftUI/Assets.xcassets",
-        "ActionAidSwiftUI/ActionAidSwiftUI/Assets.xcassets/AppIcon.appiconset",
-        "ActionAidSwiftUI/ActionAidSwiftUI/Assets.xcassets/AccentColor.colorset",
-    ]
-    
-    for directory in directories:
-        os.makedirs(directory, exist_ok=True)
-        print(f"✅ Created: {directory}")
+# With --incremental the existing project is kept and unchanged files are not rewritten
+INCREMENTAL = "--incremental" in sys.argv[1:]
 
-def copy_library_files():
-    """Copy the Rust library files."""
-    print("\n📚 Copying library files...")
-    
-    source_files = [
-        ("target/ios/libipad_rust_core_device.a", "ActionAidSwiftUI/ActionAidSwiftUI/Libraries/"),
-        ("target/ios/libipad_rust_core_sim.a", "ActionAidSwiftUI/ActionAidSwiftUI/Libraries/"),
-        ("target/ios/ipad_rust_core.h", "ActionAidSwiftUI/ActionAidSwiftUI/Libraries/"),
-    ]
-    
-    for source, dest_dir in source_files:
-        if os.path.exists(source):
-            shutil.copy2(source, dest_dir)
-            print(f"✅ Copied: {os.path.basename(source)}")
-        else:
-            print(f"❌ Missing: {source}")
-            return False
-    
-    return True
+# File-type bits (S_IFMT) keyed by absolute path, None when the path is missing
+_stat_cache = {}
+
+def cached_mode(path):
+    """Return the file-type bits of path, stat()ing it at most once per run."""
+    abs_path = os.path.abspath(path)
+    if abs_path not in _stat_cache:
+        try:
+            _stat_cache[abs_path] = stat.S_IFMT(os.stat(abs_path).st_mode)
+        except OSError:
+            _stat_cache[abs_path] = None
+    return _stat_cache[abs_path]
+
+def cached_exists(path):
+    """Return True if path exists."""
+    return cached_mode(path) is not None
+
+def cached_isdir(path):
+    """Return True if path is a directory."""
+    mode = cached_mode(path)
+    return mode is not None and stat.S_ISDIR(mode)
+
+def cached_isfile(path):
+    """Return True if path is a regular file."""
+    mode = cached_mode(path)
+    return mode is not None and stat.S_ISREG(mode)
 
-def create_app_file():
-    """Create the main App file."""
-    content = '''//
+# Templates for the generated project files
+_APP_SWIFT = '''//
 //  ActionAidSwiftUIApp.swift
 //  ActionAidSwiftUI
 //
@@ -71,14 +66,8 @@ struct ActionAidSwiftUIApp: App {
     }
 }
 '''
-    
-    with open("ActionAidSwiftUI/ActionAidSwiftUI/ActionAidSwiftUIApp.swift", "w") as f:
-        f.write(content)
-    print("✅ Created: ActionAidSwiftUIApp.swift")
 
-def create_content_view():
-    """Create the main SwiftUI content view."""
-    content = '''//
+_CONTENT_VIEW_SWIFT = '''//
 //  ContentView.swift
 //  ActionAidSwiftUI
 //
@@ -348,14 +337,8 @@ struct ContentView: View {
     ContentView()
 }
 '''
-    
-    with open("ActionAidSwiftUI/ActionAidSwiftUI/ContentView.swift", "w") as f:
-        f.write(content)
-    print("✅ Created: ContentView.swift")
 
-def create_bridging_header():
-    """Create the bridging header."""
-    content = '''//
+_BRIDGING_H = '''//
 //  ActionAidSwiftUI-Bridging-Header.h
 //  ActionAidSwiftUI
 //
@@ -369,14 +352,8 @@ def create_bridging_header():
 
 #endif /* ActionAidSwiftUI_Bridging_Header_h */
 '''
-    
-    with open("ActionAidSwiftUI/ActionAidSwiftUI/ActionAidSwiftUI-Bridging-Header.h", "w") as f:
-        f.write(content)
-    print("✅ Created: ActionAidSwiftUI-Bridging-Header.h")
 
-def create_info_plist():
-    """Create the Info.plist file."""
-    content = '''<?xml version="1.0" encoding="UTF-8"?>
+_INFO_PLIST = '''<?xml version="1.0" encoding="UTF-8"?>
 <!DOCTYPE plist PUBLIC "-//Apple//DTD PLIST 1.0//EN" "http://www.apple.com/DTDs/PropertyList-1.0.dtd">
 <plist version="1.0">
 <dict>
@@ -422,147 +399,184 @@ def create_info_plist():
 </dict>
 </plist>
 '''
-    
-    with open("ActionAidSwiftUI/ActionAidSwiftUI/Info.plist", "w") as f:
-        f.write(content)
-    print("✅ Created: Info.plist")
 
-def create_assets():
-    """Create basic asset catalog files."""
+# Asset catalog manifests; Xcode reads compact JSON just as well as its own layout
+_XCODE_INFO = {"author": "xcode", "version": 1}
+
+_APPICON_IMAGES = [
+    ("iphone", "2x", "20x20"), ("iphone", "3x", "20x20"),
+    ("iphone", "2x", "29x29"), ("iphone", "3x", "29x29"),
+    ("iphone", "2x", "40x40"), ("iphone", "3x", "40x40"),
+    ("iphone", "2x", "60x60"), ("iphone", "3x", "60x60"),
+    ("ipad", "1x", "20x20"), ("ipad", "2x", "20x20"),
+    ("ipad", "1x", "29x29"), ("ipad", "2x", "29x29"),
+    ("ipad", "1x", "40x40"), ("ipad", "2x", "40x40"),
+    ("ipad", "2x", "76x76"), ("ipad", "2x", "83.5x83.5"),
+    ("ios-marketing", "1x", "1024x1024"),
+]
+
+_APPICON_CONTENTS = {
+    "images": [{"idiom": idiom, "scale": scale, "size": size} for idiom, scale, size in _APPICON_IMAGES],
+    "info": _XCODE_INFO,
+}
+_ACCENT_CONTENTS = {"colors": [{"idiom": "universal"}], "info": _XCODE_INFO}
+_ASSETS_CONTENTS = {"info": _XCODE_INFO}
+
+_APPICON_JSON = json.dumps(_APPICON_CONTENTS, separators=(",", ":"))
+_ACCENT_JSON = json.dumps(_ACCENT_CONTENTS, separators=(",", ":"))
+_ASSETS_JSON = json.dumps(_ASSETS_CONTENTS, separators=(",", ":"))
+
+# Every generated project file, encoded once at import and written by one write_files call
+_PROJECT_DIR = "ActionAidSwiftUI/ActionAidSwiftUI"
+_ASSETS_DIR = f"{_PROJECT_DIR}/Assets.xcassets"
+_PROJECT_FILES = {
+    f"{_PROJECT_DIR}/ActionAidSwiftUIApp.swift": _APP_SWIFT.encode("utf-8"),
+    f"{_PROJECT_DIR}/ContentView.swift": _CONTENT_VIEW_SWIFT.encode("utf-8"),
+    f"{_PROJECT_DIR}/ActionAidSwiftUI-Bridging-Header.h": _BRIDGING_H.encode("utf-8"),
+    f"{_PROJECT_DIR}/Info.plist": _INFO_PLIST.encode("utf-8"),
+    f"{_ASSETS_DIR}/AppIcon.appiconset/Contents.json": _APPICON_JSON.encode("utf-8"),
+    f"{_ASSETS_DIR}/AccentColor.colorset/Contents.json": _ACCENT_JSON.encode("utf-8"),
+    f"{_ASSETS_DIR}/Contents.json": _ASSETS_JSON.encode("utf-8"),
+}
+
+# One status line per source file, and one for the whole asset catalog
+_CREATED_FILES = "".join(
+    f"✅ Created: {os.path.basename(path)}\n" for path in _PROJECT_FILES if not path.startswith(_ASSETS_DIR)
+) + "✅ Created: Asset catalog files\n"
+
+# Static guidance printed once the project has been generated
+_NEXT_STEPS = "\n".join([
+    "\n🎉 SwiftUI Project Created Successfully!",
+    "\n📱 Next steps:",
+    "1. Open ActionAidSwiftUI.xcodeproj in Xcode",
+    "2. The project is pre-configured with:",
+    "   ✅ SwiftUI interface",
+    "   ✅ Bridging header configured",
+    "   ✅ Library search paths set",
+    "   ✅ Required frameworks linked",
+    "   ✅ Complete test suite",
+    "3. Build and run the project!",
+    "4. Tap 'Run Tests' to test your Rust library!",
+    "\n🚀 Your SwiftUI app is ready to go!",
+]) + "\n"
+
+def _file_matches(path, data):
+    """Return True if the file at path already holds exactly data."""
+    try:
+        with open(path, "rb") as f:
+            return f.read() == data
+    except OSError:
+        return False
+
+def write_files(files):
+    """Write each {path: bytes} entry with a single open/write/close."""
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_CLOEXEC", 0)
+    for path, content in files.items():
+        data = memoryview(content)
+        if INCREMENTAL and _file_matches(path, data):
+            continue
+        fd = os.open(path, flags, 0o644)
+        try:
+            while data:
+                data = data[os.write(fd, data):]
+        finally:
+            os.close(fd)
+
+def create_directory_structure():
+    """Create the basic directory structure."""
+    print("🏗️ Creating directory structure...")
     
-    # AppIcon Contents.json
-    appicon_content = '''{
-  "images" : [
-    {
-      "idiom" : "iphone",
-      "scale" : "2x",
-      "size" : "20x20"
-    },
-    {
-      "idiom" : "iphone",
-      "scale" : "3x",
-      "size" : "20x20"
-    },
-    {
-      "idiom" : "iphone",
-      "scale" : "2x",
-      "size" : "29x29"
-    },
-    {
-      "idiom" : "iphone",
-      "scale" : "3x",
-      "size" : "29x29"
-    },
-    {
-      "idiom" : "iphone",
-      "scale" : "2x",
-      "size" : "40x40"
-    },
-    {
-      "idiom" : "iphone",
-      "scale" : "3x",
-      "size" : "40x40"
-    },
-    {
-      "idiom" : "iphone",
-      "scale" : "2x",
-      "size" : "60x60"
-    },
-    {
-      "idiom" : "iphone",
-      "scale" : "3x",
-      "size" : "60x60"
-    },
-    {
-      "idiom" : "ipad",
-      "scale" : "1x",
-      "size" : "20x20"
-    },
-    {
-      "idiom" : "ipad",
-      "scale" : "2x",
-      "size" : "20x20"
-    },
-    {
-      "idiom" : "ipad",
-      "scale" : "1x",
-      "size" : "29x29"
-    },
-    {
-      "idiom" : "ipad",
-      "scale" : "2x",
-      "size" : "29x29"
-    },
-    {
-      "idiom" : "ipad",
-      "scale" : "1x",
-      "size" : "40x40"
-    },
-    {
-      "idiom" : "ipad",
-      "scale" : "2x",
-      "size" : "40x40"
-    },
-    {
-      "idiom" : "ipad",
-      "scale" : "2x",
-      "size" : "76x76"
-    },
-    {
-      "idiom" : "ipad",
-      "scale" : "2x",
-      "size" : "83.5x83.5"
-    },
-    {
-      "idiom" : "ios-marketing",
-      "scale" : "1x",
-      "size" : "1024x1024"
-    }
-  ],
-  "info" : {
-    "author" : "xcode",
-    "version" : 1
-  }
-}'''
+    # Move the old project aside and delete it while the new one is built. mkdtemp picks a
+    # fresh name, so a trash directory left behind by an interrupted run can't collide
+    if not INCREMENTAL and cached_exists("ActionAidSwiftUI"):
+        trash = tempfile.mkdtemp(prefix="ActionAidSwiftUI.old.", dir=".")
+        os.rename("ActionAidSwiftUI", os.path.join(trash, "ActionAidSwiftUI"))
+        _stat_cache.pop(os.path.abspath("ActionAidSwiftUI"), None)
+        threading.Thread(target=shutil.rmtree, args=(trash,), kwargs={"ignore_errors": True}).start()
+    
+    # Leaf directories only; makedirs creates the intermediate parents
+    directories = [
+        "ActionAidSwiftUI/ActionAidSwiftUI.xcodeproj",
+        "ActionAidSwiftUI/ActionAidSwiftUI/Libraries",
+        "ActionAidSwiftUI/ActionAidSwiftUI/Assets.xcassets/AppIcon.appiconset",
+        "ActionAidSwiftUI/ActionAidSwiftUI/Assets.xcassets/AccentColor.colorset",
+    ]
     
-    with open("ActionAidSwiftUI/ActionAidSwiftUI/Assets.xcassets/AppIcon.appiconset/Contents.json", "w") as f:
-        f.write(appicon_content)
+    for directory in directories:
+        os.makedirs(directory, exist_ok=True)
+    sys.stdout.write("".join(f"✅ Created: {directory}\n" for directory in directories))
+
+def _copy_is_current(source, dest):
+    """Return True if dest already matches source by size and mtime."""
+    # copy2, cp -p and ditto preserve mtime, so size + mtime identify an unchanged copy
+    src_stat = os.stat(source)
+    try:
+        dest_stat = os.stat(dest)
+    except FileNotFoundError:
+        return False
+    return (dest_stat.st_size, dest_stat.st_mtime) == (src_stat.st_size, src_stat.st_mtime)
+
+def fast_copy(source, dest_dir):
+    """Copy source into dest_dir, cloning the file on APFS when possible."""
+    dest = os.path.join(dest_dir, os.path.basename(source))
+    if INCREMENTAL and _copy_is_current(source, dest):
+        return dest
+    if sys.platform == "darwin":
+        # cp -c uses clonefile(2): a copy-on-write clone instead of a byte copy
+        try:
+            subprocess.run(["cp", "-c", "-p", source, dest], check=True, capture_output=True)
+            return dest
+        except (OSError, subprocess.CalledProcessError):
+            pass
+    return shutil.copy2(source, dest)
+
+def ditto_copy(sources, dest_dir):
+    """Copy all sources into dest_dir with one ditto process; return True on success."""
+    if sys.platform != "darwin":
+        return False
+    if INCREMENTAL:
+        sources = [source for source in sources
+                   if not _copy_is_current(source, os.path.join(dest_dir, os.path.basename(source)))]
+        if not sources:
+            return True
+    # ditto clones on APFS and preserves metadata for every file in one pass
+    try:
+        subprocess.run(["ditto", *sources, dest_dir], check=True, capture_output=True)
+        return True
+    except (OSError, subprocess.CalledProcessError):
+        return False
+
+def copy_library_files(messages):
+    """Copy the Rust library files, appending status lines to messages for the caller to print."""
+    messages.append("\n📚 Copying library files...\n")
     
-    # AccentColor Contents.json
-    accent_content = '''{
-  "colors" : [
-    {
-      "idiom" : "universal"
-    }
-  ],
-  "info" : {
-    "author" : "xcode",
-    "version" : 1
-  }
-}'''
+    dest_dir = "ActionAidSwiftUI/ActionAidSwiftUI/Libraries/"
+    source_files = [
+        "target/ios/libipad_rust_core_device.a",
+        "target/ios/libipad_rust_core_sim.a",
+        "target/ios/ipad_rust_core.h",
+    ]
     
-    with open("ActionAidSwiftUI/ActionAidSwiftUI/Assets.xcassets/AccentColor.colorset/Contents.json", "w") as f:
-        f.write(accent_content)
+    for source in source_files:
+        if not cached_isfile(source):
+            messages.append(f"❌ Missing: {source}\n")
+            return False
     
-    # Main Assets Contents.json
-    assets_content = '''{
-  "info" : {
-    "author" : "xcode",
-    "version" : 1
-  }
-}'''
+    if not ditto_copy(source_files, dest_dir):
+        # The copies are independent and I/O-bound, so run them concurrently
+        with ThreadPoolExecutor(max_workers=len(source_files)) as executor:
+            list(executor.map(lambda source: fast_copy(source, dest_dir), source_files))
     
-    with open("ActionAidSwiftUI/ActionAidSwiftUI/Assets.xcassets/Contents.json", "w") as f:
-        f.write(assets_content)
+    messages.extend(f"✅ Copied: {os.path.basename(source)}\n" for source in source_files)
     
-    print("✅ Created: Asset catalog files")
+    return True
 
 def main():
     print("🚀 Creating SwiftUI iPad Rust Core Project")
     print("==========================================")
     
     # Check if we're in the right directory
-    if not os.path.exists("target/ios"):
+    if not cached_isdir("target/ios"):
         print("❌ Please run this script from the project root directory")
         print("   (the directory containing the 'target/ios' folder)")
         return 1
@@ -570,30 +584,23 @@ def main():
     # Create directory structure
     create_directory_structure()
     
-    # Copy library files
-    if not copy_library_files():
+    # Copy library files in the background; the generated files don't depend on them.
+    # The copy's status lines are held back so they don't interleave with the main thread's
+    copy_messages = []
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        library_copy = executor.submit(copy_library_files, copy_messages)
+        
+        # Create the Swift, header, plist and asset catalog files
+        write_files(_PROJECT_FILES)
+        sys.stdout.write(_CREATED_FILES)
+    
+    copied = library_copy.result()
+    sys.stdout.write("".join(copy_messages))
+    if not copied:
         print("\n❌ Failed to copy library files!")
         return 1
     
-    # Create Swift files
-    create_app_file()
-    create_content_view()
-    create_bridging_header()
-    create_info_plist()
-    create_assets()
-    
-    print("\n🎉 SwiftUI Project Created Successfully!")
-    print("\n📱 Next steps:")
-    print("1. Open ActionAidSwiftUI.xcodeproj in Xcode")
-    print("2. The project is pre-configured with:")
-    print("   ✅ SwiftUI interface")
-    print("   ✅ Bridging header configured")
-    print("   ✅ Library search paths set")
-    print("   ✅ Required frameworks linked")
-    print("   ✅ Complete test suite")
-    print("3. Build and run the project!")
-    print("4. Tap 'Run Tests' to test your Rust library!")
-    print("\n🚀 Your SwiftUI app is ready to go!")
+    sys.stdout.write(_NEXT_STEPS)
     
     return 0
 
@@ -2,18 +2,54 @@
 """
 Manual Debug Session for Compression System
 Checks which document and photo files were compressed in the iPad simulator.
+Pass --json for one NDJSON record per section and --out FILE[.gz] to write the report to a file.
+The database is only read unless --create-indexes is given.
 """
 
 import sqlite3
 import os
+import sys
+import gzip
 import json
+import argparse
+import contextlib
+import functools
+from array import array
 from datetime import datetime
 from pathlib import Path
-import hashlib
-import subprocess
+
+SIMULATOR_DEVICES_DIR = os.path.expanduser("~/Library/Developer/CoreSimulator/Devices")
+
+def _subdirectories(path):
+    """Non-hidden subdirectories of path, or nothing if it can't be read"""
+    try:
+        with os.scandir(path) as it:
+            return [entry.path for entry in it if not entry.name.startswith('.') and entry.is_dir()]
+    except OSError:
+        return []
+
+@functools.cache
+def list_simulator_documents():
+    """Documents directories of every simulator app: Devices/*/data/Containers/Data/Application/*/Documents"""
+    documents = []
+    for device in _subdirectories(SIMULATOR_DEVICES_DIR):
+        for app in _subdirectories(os.path.join(device, "data", "Containers", "Data", "Application")):
+            app_documents = os.path.join(app, "Documents")
+            if os.path.isdir(app_documents):
+                documents.append(app_documents)
+    return tuple(documents)
 
 class CompressionDebugger:
-    def __init__(self, db_path=None, storage_path=None):
+    # Storage subdirectories indexed once for per-document existence checks
+    INDEXED_DIRS = ("original", "compressed")
+    # Documents rendered per stdout write in the per-document listings
+    WRITE_BATCH = 256
+    BYTE_UNITS = ("B", "KB", "MB", "GB", "TB")
+    
+    def __init__(self, db_path=None, storage_path=None, json_output=False, create_indexes=False):
+        # Emit one NDJSON record per report section instead of the formatted report
+        self.json_output = json_output
+        
         # Try to find the database automatically
         if db_path is None:
             db_path = self.find_database()
@@ -23,28 +59,72 @@ class CompressionDebugger:
             
         self.db_path = db_path
         self.storage_path = storage_path
-        
-        print(f"🔍 Database: {self.db_path}")
-        print(f"📁 Storage: {self.storage_path}")
-        
+        self._stats = None
+        self._files = None
+        
+        # One read-only connection shared by every report section. query_only rather than
+        # mode=ro, so closing it still cleans up the WAL files like any other last connection
+        self.conn = sqlite3.connect(self.db_path, isolation_level=None)
+        if create_indexes:
+            self.ensure_debug_indexes()
+        self.conn.execute("PRAGMA query_only = 1")
+        # Keep temp b-trees from the GROUP BY/ORDER BY passes in memory and let SQLite mmap the file
+        self.conn.execute("PRAGMA temp_store = MEMORY")
+        self.conn.execute("PRAGMA cache_size = -64000")
+        self.conn.execute("PRAGMA mmap_size = 268435456")
+        
+        # Table names looked up once for the optional report sections
+        self._tables = {row[0] for row in self.conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        
+        if not self.json_output:
+            print(f"🔍 Database: {self.db_path}")
+            print(f"📁 Storage: {self.storage_path}")
+        
+    def ensure_debug_indexes(self):
+        """Create the indexes the report queries filter and sort on, if missing (--create-indexes only)"""
+        indexes = [
+            # Status listings: WHERE compression_status = ? AND file_path != 'ERROR' ORDER BY created_at DESC
+            """CREATE INDEX IF NOT EXISTS idx_media_compression_status_created
+                   ON media_documents(compression_status, created_at DESC)
+                   WHERE file_path != 'ERROR'""",
+            # Per-type rollups grouped by (type_id, compression_status)
+            """CREATE INDEX IF NOT EXISTS idx_media_type_status
+                   ON media_documents(type_id, compression_status)""",
+        ]
+        try:
+            for sql in indexes:
+                self.conn.execute(sql)
+        except sqlite3.OperationalError as e:
+            # Read-only or locked database: the reports still work, just without the indexes
+            print(f"⚠️ Could not create debug indexes: {e}", file=sys.stderr if self.json_output else sys.stdout)
+    
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
     def find_database(self):
         """Find the SQLite database file"""
         possible_paths = [
             "./storage/actionaid.db",
             "../storage/actionaid.db", 
             "./actionaid.db",
-            os.path.expanduser("~/Library/Developer/CoreSimulator/Devices/*/data/Containers/Data/Application/*/Documents/actionaid.db"),
         ]
         
-        for pattern in possible_paths:
-            if '*' in pattern:
-                # Use glob for wildcard patterns
-                import glob
-                matches = glob.glob(pattern)
-                if matches:
-                    return matches[0]
-            elif os.path.exists(pattern):
-                return pattern
+        for path in possible_paths:
+            if os.path.exists(path):
+                return path
+        
+        # Fall back to the first simulator app that has a database
+        for docs in list_simulator_documents():
+            db_path = os.path.join(docs, 'actionaid.db')
+            if os.path.exists(db_path):
+                return db_path
                 
         # Try finding with environment variable
         ios_docs = os.environ.get('IOS_DOCUMENTS_DIR')
@@ -60,17 +140,15 @@ class CompressionDebugger:
         possible_paths = [
             "./storage",
             "../storage",
-            os.path.expanduser("~/Library/Developer/CoreSimulator/Devices/*/data/Containers/Data/Application/*/Documents"),
         ]
         
-        for pattern in possible_paths:
-            if '*' in pattern:
-                import glob
-                matches = glob.glob(pattern)
-                if matches:
-                    return matches[0]
-            elif os.path.exists(pattern):
-                return pattern
+        for path in possible_paths:
+            if os.path.exists(path):
+                return path
+        
+        simulator_docs = list_simulator_documents()
+        if simulator_docs:
+            return simulator_docs[0]
                 
         ios_docs = os.environ.get('IOS_DOCUMENTS_DIR')
         if ios_docs:
@@ -78,29 +156,101 @@ class CompressionDebugger:
             
         return "./storage"  # fallback
     
+    def _compression_stats(self):
+        """Aggregate media_documents by (type, status) in one pass and cache the result"""
+        if self._stats is None:
+            cursor = self.conn.cursor()
+            
+            cursor.execute("""
+                SELECT 
+                    type_id,
+                    compression_status,
+                    COUNT(*) as count,
+                    SUM(size_bytes) as total_original_size,
+                    SUM(CASE WHEN compressed_size_bytes IS NOT NULL THEN compressed_size_bytes ELSE 0 END) as total_compressed_size
+                FROM media_documents 
+                WHERE file_path != 'ERROR'
+                GROUP BY type_id, compression_status
+            """)
+            groups = {
+                (type_id, status): (count, orig_size or 0, comp_size or 0)
+                for type_id, status, count, orig_size, comp_size in cursor.fetchall()
+            }
+            
+            cursor.execute("""
+                SELECT id, name, compression_level, compression_method, min_size_for_compression
+                FROM document_types
+            """)
+            types = cursor.fetchall()
+            self._stats = {"groups": groups, "types": types}
+        return self._stats
+    
+    def _iter_rows(self, cursor, batch_size=1024):
+        """Yield rows from an executed cursor in bounded fetchmany batches"""
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                return
+            yield from batch
+    
+    def _write_lines(self, lines):
+        """Write buffered report lines to stdout in one call and empty the buffer"""
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
+            lines.clear()
+    
+    def _emit(self, section, rows=None, **fields):
+        """Write one compact NDJSON record for a report section"""
+        record = {"section": section, **fields}
+        if rows is not None:
+            record["rows"] = rows
+        sys.stdout.write(json.dumps(record, separators=(',', ':'), default=str) + "\n")
+    
+    def _emit_rows(self, section, rows):
+        """Emit rows as records of at most WRITE_BATCH rows; always emits at least one record"""
+        batch = []
+        emitted = False
+        for row in rows:
+            batch.append(row)
+            if len(batch) == self.WRITE_BATCH:
+                self._emit(section, batch)
+                batch = []
+                emitted = True
+        if batch or not emitted:
+            self._emit(section, batch)
+    
+    def _dict_rows(self, cursor):
+        """Yield the remaining rows of an executed cursor as column-name dicts"""
+        columns = [column[0] for column in cursor.description]
+        for row in self._iter_rows(cursor):
+            yield dict(zip(columns, row))
+    
     def get_compression_overview(self):
         """Get overall compression statistics"""
-        print("\n" + "="*80)
-        print("🔍 COMPRESSION OVERVIEW")
-        print("="*80)
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Get compression status breakdown
-        cursor.execute("""
-            SELECT 
-                compression_status,
-                COUNT(*) as count,
-                SUM(size_bytes) as total_original_size,
-                SUM(CASE WHEN compressed_size_bytes IS NOT NULL THEN compressed_size_bytes ELSE 0 END) as total_compressed_size
-            FROM media_documents 
-            WHERE file_path != 'ERROR'
-            GROUP BY compression_status
-            ORDER BY count DESC
-        """)
+        if not self.json_output:
+            print("\n" + "="*80)
+            print("🔍 COMPRESSION OVERVIEW")
+            print("="*80)
         
-        results = cursor.fetchall()
+        # Status breakdown, rolled up from the cached per-(type, status) aggregates
+        by_status = {}
+        for (_, status), (count, orig_size, comp_size) in self._compression_stats()["groups"].items():
+            totals = by_status.setdefault(status, [0, 0, 0])
+            totals[0] += count
+            totals[1] += orig_size
+            totals[2] += comp_size
+        results = sorted(
+            ((status, count, orig_size, comp_size) for status, (count, orig_size, comp_size) in by_status.items()),
+            key=lambda row: row[1],
+            reverse=True,
+        )
+        
+        if self.json_output:
+            self._emit("overview", [
+                {"status": status, "count": count, "original_size": orig_size, "compressed_size": comp_size}
+                for status, count, orig_size, comp_size in results
+            ])
+            return
         
         print("\n📊 Status Breakdown:")
         total_docs = 0
@@ -120,19 +270,33 @@ class CompressionDebugger:
             savings = total_original - total_compressed
             percentage = (savings / total_original) * 100
             print(f"💾 Space Saved: {self.format_bytes(savings)} ({percentage:.1f}%)")
-        
-        conn.close()
     
     def get_compressed_documents(self):
         """Get all documents that have been compressed"""
-        print("\n" + "="*80)
-        print("✅ SUCCESSFULLY COMPRESSED DOCUMENTS")
-        print("="*80)
+        if not self.json_output:
+            print("\n" + "="*80)
+            print("✅ SUCCESSFULLY COMPRESSED DOCUMENTS")
+            print("="*80)
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self.conn.cursor()
         
-        cursor.execute("""
+        where = """
+            WHERE compression_status = 'completed' 
+                AND compressed_file_path IS NOT NULL
+                AND file_path != 'ERROR'
+        """
+        
+        if not self.json_output:
+            cursor.execute(f"SELECT COUNT(*) FROM media_documents {where}")
+            total = cursor.fetchone()[0]
+            
+            if not total:
+                print("❌ No compressed documents found!")
+                return
+            
+            print(f"\n🎯 Found {total} compressed documents:")
+        
+        cursor.execute(f"""
             SELECT 
                 id,
                 original_filename,
@@ -144,102 +308,118 @@ class CompressionDebugger:
                 created_at,
                 related_table
             FROM media_documents 
-            WHERE compression_status = 'completed' 
-                AND compressed_file_path IS NOT NULL
-                AND file_path != 'ERROR'
+            {where}
             ORDER BY created_at DESC
         """)
         
-        results = cursor.fetchall()
-        
-        if not results:
-            print("❌ No compressed documents found!")
-            conn.close()
+        if self.json_output:
+            self._emit_rows("compressed_documents", (
+                {**doc, "original_disk_size": self._file_size(doc["file_path"]),
+                 "compressed_disk_size": self._file_size(doc["compressed_file_path"])}
+                for doc in self._dict_rows(cursor)
+            ))
             return
         
-        print(f"\n🎯 Found {len(results)} compressed documents:")
-        
-        for doc in results:
+        lines = []
+        for i, doc in enumerate(self._iter_rows(cursor), 1):
             doc_id, filename, mime, orig_size, comp_size, orig_path, comp_path, created, table = doc
             
             savings = orig_size - (comp_size or orig_size)
             percentage = (savings / orig_size) * 100 if orig_size > 0 else 0
             
-            print(f"\n📄 {filename}")
-            print(f"   🆔 ID: {doc_id[:8]}...")
-            print(f"   🗂️ Type: {mime} ({table})")
-            print(f"   📏 Size: {self.format_bytes(orig_size)} → {self.format_bytes(comp_size or 0)}")
-            print(f"   💾 Saved: {self.format_bytes(savings)} ({percentage:.1f}%)")
-            print(f"   📁 Original: {orig_path}")
-            print(f"   🗜️ Compressed: {comp_path}")
-            print(f"   📅 Created: {created}")
+            lines += [
+                f"\n📄 {filename}",
+                f"   🆔 ID: {doc_id[:8]}...",
+                f"   🗂️ Type: {mime} ({table})",
+                f"   📏 Size: {self.format_bytes(orig_size)} → {self.format_bytes(comp_size or 0)}",
+                f"   💾 Saved: {self.format_bytes(savings)} ({percentage:.1f}%)",
+                f"   📁 Original: {orig_path}",
+                f"   🗜️ Compressed: {comp_path}",
+                f"   📅 Created: {created}",
+            ]
             
             # Check if files actually exist
-            self.check_file_existence(orig_path, comp_path)
-        
-        conn.close()
+            lines += self.file_existence_lines(orig_path, comp_path)
+            
+            if i % self.WRITE_BATCH == 0:
+                self._write_lines(lines)
+        self._write_lines(lines)
     
     def get_failed_compressions(self):
         """Get documents that failed compression"""
-        print("\n" + "="*80)
-        print("❌ FAILED COMPRESSIONS")
-        print("="*80)
+        if not self.json_output:
+            print("\n" + "="*80)
+            print("❌ FAILED COMPRESSIONS")
+            print("="*80)
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self.conn.cursor()
         
-        cursor.execute("""
-            SELECT 
-                id,
-                original_filename,
-                mime_type,
-                size_bytes,
-                file_path,
-                error_message,
-                has_error
-            FROM media_documents 
-            WHERE compression_status = 'failed' 
-                OR has_error = 1
+        where = """
+            WHERE (compression_status = 'failed' OR has_error = 1)
                 AND file_path != 'ERROR'
-            ORDER BY created_at DESC
-        """)
+        """
+        
+        if self.json_output:
+            cursor.execute(f"""
+                SELECT id, original_filename, mime_type, size_bytes, file_path, error_message, has_error
+                FROM media_documents
+                {where}
+                ORDER BY created_at DESC
+            """)
+            self._emit_rows("failed_compressions", self._dict_rows(cursor))
+            return
         
-        results = cursor.fetchall()
+        cursor.execute(f"SELECT COUNT(*) FROM media_documents {where}")
+        total = cursor.fetchone()[0]
         
-        if not results:
+        if not total:
             print("✅ No failed compressions found!")
         else:
-            print(f"\n🚨 Found {len(results)} failed documents:")
-            for doc in results:
+            print(f"\n🚨 Found {total} failed documents:")
+            cursor.execute(f"""
+                SELECT 
+                    id,
+                    original_filename,
+                    mime_type,
+                    size_bytes,
+                    file_path,
+                    error_message,
+                    has_error
+                FROM media_documents 
+                {where}
+                ORDER BY created_at DESC
+            """)
+            lines = []
+            for i, doc in enumerate(self._iter_rows(cursor), 1):
                 doc_id, filename, mime, size, path, error, has_error = doc
-                print(f"\n📄 {filename}")
-                print(f"   🆔 ID: {doc_id[:8]}...")
-                print(f"   🗂️ Type: {mime}")
-                print(f"   📏 Size: {self.format_bytes(size)}")
-                print(f"   ❌ Error: {error or 'Unknown error'}")
-                print(f"   📁 Path: {path}")
-        
-        conn.close()
+                lines += [
+                    f"\n📄 {filename}",
+                    f"   🆔 ID: {doc_id[:8]}...",
+                    f"   🗂️ Type: {mime}",
+                    f"   📏 Size: {self.format_bytes(size)}",
+                    f"   ❌ Error: {error or 'Unknown error'}",
+                    f"   📁 Path: {path}",
+                ]
+                if i % self.WRITE_BATCH == 0:
+                    self._write_lines(lines)
+            self._write_lines(lines)
     
     def get_compression_queue_status(self):
         """Check the compression queue"""
-        print("\n" + "="*80)
-        print("🔄 COMPRESSION QUEUE STATUS")
-        print("="*80)
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Check if compression_queue table exists
-        cursor.execute("""
-            SELECT name FROM sqlite_master WHERE type='table' AND name='compression_queue'
-        """)
+        if not self.json_output:
+            print("\n" + "="*80)
+            print("🔄 COMPRESSION QUEUE STATUS")
+            print("="*80)
         
-        if not cursor.fetchone():
-            print("ℹ️ No compression_queue table found")
-            conn.close()
+        if 'compression_queue' not in self._tables:
+            if self.json_output:
+                self._emit("compression_queue", [], table_exists=False)
+            else:
+                print("ℹ️ No compression_queue table found")
             return
         
+        cursor = self.conn.cursor()
+        
         cursor.execute("""
             SELECT 
                 document_id,
@@ -255,58 +435,103 @@ class CompressionDebugger:
             LIMIT 20
         """)
         
+        if self.json_output:
+            self._emit("compression_queue", list(self._dict_rows(cursor)), table_exists=True)
+            return
+        
         results = cursor.fetchall()
         
         if not results:
             print("📭 Queue is empty")
         else:
             print(f"\n📋 Found {len(results)} queue entries (showing latest 20):")
+            lines = []
             for entry in results:
                 doc_id, priority, status, queued, started, completed, error, attempts = entry
-                print(f"\n🔄 Document: {doc_id[:8]}...")
-                print(f"   🚦 Status: {status}")
-                print(f"   ⚡ Priority: {priority}")
-                print(f"   📅 Queued: {queued}")
-                print(f"   🏃 Started: {started or 'Not started'}")
-                print(f"   ✅ Completed: {completed or 'Not completed'}")
-                print(f"   🔄 Attempts: {attempts}")
+                lines += [
+                    f"\n🔄 Document: {doc_id[:8]}...",
+                    f"   🚦 Status: {status}",
+                    f"   ⚡ Priority: {priority}",
+                    f"   📅 Queued: {queued}",
+                    f"   🏃 Started: {started or 'Not started'}",
+                    f"   ✅ Completed: {completed or 'Not completed'}",
+                    f"   🔄 Attempts: {attempts}",
+                ]
                 if error:
-                    print(f"   ❌ Error: {error}")
-        
-        conn.close()
+                    lines.append(f"   ❌ Error: {error}")
+            self._write_lines(lines)
+    
+    def _file_index(self):
+        """Map storage-relative path -> size for everything under original/ and compressed/"""
+        if self._files is None:
+            self._files = {}
+            for subdir in self.INDEXED_DIRS:
+                directory = os.path.join(self.storage_path, subdir)
+                if not os.path.isdir(directory):
+                    continue
+                for entry, rel_path in self._walk_files(directory):
+                    self._files[os.path.join(subdir, rel_path)] = entry.stat().st_size
+        return self._files
+    
+    def _file_size(self, rel_path):
+        """Return the size of a stored file, or None if it does not exist"""
+        normalized = os.path.normpath(rel_path)
+        if normalized.split(os.sep, 1)[0] in self.INDEXED_DIRS:
+            return self._file_index().get(normalized)
+        
+        # Outside the indexed trees (e.g. an absolute path): look it up directly
+        full_path = Path(self.storage_path) / rel_path
+        return full_path.stat().st_size if full_path.is_file() else None
     
     def check_file_existence(self, orig_path, comp_path):
         """Check if files exist on disk"""
-        storage_base = Path(self.storage_path)
+        self._write_lines(self.file_existence_lines(orig_path, comp_path))
+    
+    def file_existence_lines(self, orig_path, comp_path):
+        """Report lines describing whether a document's files exist on disk"""
+        lines = []
         
         # Check original file
-        orig_full_path = storage_base / orig_path
-        orig_exists = orig_full_path.exists()
-        orig_size = orig_full_path.stat().st_size if orig_exists else 0
+        orig_size = self._file_size(orig_path)
+        orig_exists = orig_size is not None
+        orig_size = orig_size or 0
         
-        print(f"   📁 Original exists: {'✅' if orig_exists else '❌'} ({self.format_bytes(orig_size)})")
+        lines.append(f"   📁 Original exists: {'✅' if orig_exists else '❌'} ({self.format_bytes(orig_size)})")
         
         # Check compressed file
         if comp_path:
-            comp_full_path = storage_base / comp_path
-            comp_exists = comp_full_path.exists()
-            comp_size = comp_full_path.stat().st_size if comp_exists else 0
+            comp_size = self._file_size(comp_path)
+            comp_exists = comp_size is not None
+            comp_size = comp_size or 0
             
-            print(f"   🗜️ Compressed exists: {'✅' if comp_exists else '❌'} ({self.format_bytes(comp_size)})")
+            lines.append(f"   🗜️ Compressed exists: {'✅' if comp_exists else '❌'} ({self.format_bytes(comp_size)})")
             
             if comp_exists and orig_exists:
                 savings = orig_size - comp_size
                 percentage = (savings / orig_size) * 100 if orig_size > 0 else 0
-                print(f"   💾 Actual savings: {self.format_bytes(savings)} ({percentage:.1f}%)")
+                lines.append(f"   💾 Actual savings: {self.format_bytes(savings)} ({percentage:.1f}%)")
+        
+        return lines
     
     def scan_storage_directory(self):
         """Scan the storage directory to see what files exist"""
-        print("\n" + "="*80)
-        print("📁 STORAGE DIRECTORY SCAN")
-        print("="*80)
+        if not self.json_output:
+            print("\n" + "="*80)
+            print("📁 STORAGE DIRECTORY SCAN")
+            print("="*80)
         
         storage_path = Path(self.storage_path)
         
+        if self.json_output:
+            rows = []
+            for name in ("original", "compressed"):
+                directory = storage_path / name
+                file_count, total_size = self.scan_directory(directory, None) if directory.exists() else (0, 0)
+                rows.append({"directory": name, "path": str(directory), "exists": directory.exists(),
+                             "file_count": file_count, "total_size": total_size})
+            self._emit("storage", rows, storage_path=str(storage_path), exists=storage_path.exists())
+            return
+        
         if not storage_path.exists():
             print(f"❌ Storage directory does not exist: {storage_path}")
             return
@@ -325,60 +550,80 @@ class CompressionDebugger:
         if compressed_dir.exists():
             self.scan_directory(compressed_dir, "🗜️")
     
+    def _walk_files(self, directory):
+        """Yield (DirEntry, relative path) for every file under directory, in os.walk order"""
+        stack = [os.fspath(directory)]
+        while stack:
+            subdirs = []
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.is_file():
+                        yield entry, os.path.relpath(entry.path, directory)
+            stack.extend(reversed(subdirs))
+    
     def scan_directory(self, directory, icon):
-        """Recursively scan a directory"""
-        file_count = 0
-        total_size = 0
+        """Recursively scan a directory; returns (file_count, total_size)"""
+        # File sizes collected into a C int64 buffer and summed once at the end
+        sizes = array('q')
         
-        for root, dirs, files in os.walk(directory):
-            for file in files:
-                if file.startswith('.'):  # Skip hidden files
-                    continue
-                    
-                file_path = Path(root) / file
-                file_size = file_path.stat().st_size
-                file_count += 1
-                total_size += file_size
-                
-                # Show first few files as examples
-                if file_count <= 5:
-                    rel_path = file_path.relative_to(directory)
-                    print(f"   {icon} {rel_path} ({self.format_bytes(file_size)})")
+        for entry, rel_path in self._walk_files(directory):
+            if entry.name.startswith('.'):  # Skip hidden files
+                continue
+            
+            file_size = entry.stat().st_size
+            sizes.append(file_size)
+            
+            # Show first few files as examples
+            if len(sizes) <= 5 and not self.json_output:
+                print(f"   {icon} {rel_path} ({self.format_bytes(file_size)})")
         
-        if file_count > 5:
-            print(f"   ... and {file_count - 5} more files")
+        file_count = len(sizes)
+        total_size = sum(sizes)
         
-        print(f"   📊 Total: {file_count} files, {self.format_bytes(total_size)}")
+        if not self.json_output:
+            if file_count > 5:
+                print(f"   ... and {file_count - 5} more files")
+            
+            print(f"   📊 Total: {file_count} files, {self.format_bytes(total_size)}")
+        
+        return file_count, total_size
     
     def get_document_types_analysis(self):
         """Analyze compression by document types"""
-        print("\n" + "="*80)
-        print("📊 DOCUMENT TYPES COMPRESSION ANALYSIS")
-        print("="*80)
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT 
-                dt.name as type_name,
-                dt.compression_level,
-                dt.compression_method,
-                dt.min_size_for_compression,
-                COUNT(md.id) as doc_count,
-                SUM(CASE WHEN md.compression_status = 'completed' THEN 1 ELSE 0 END) as compressed_count,
-                SUM(CASE WHEN md.compression_status = 'failed' THEN 1 ELSE 0 END) as failed_count,
-                SUM(CASE WHEN md.compression_status = 'skipped' THEN 1 ELSE 0 END) as skipped_count,
-                AVG(md.size_bytes) as avg_size,
-                SUM(md.size_bytes) as total_original_size,
-                SUM(CASE WHEN md.compressed_size_bytes IS NOT NULL THEN md.compressed_size_bytes ELSE 0 END) as total_compressed_size
-            FROM document_types dt
-            LEFT JOIN media_documents md ON dt.id = md.type_id AND md.file_path != 'ERROR'
-            GROUP BY dt.id, dt.name
-            ORDER BY doc_count DESC
-        """)
+        if not self.json_output:
+            print("\n" + "="*80)
+            print("📊 DOCUMENT TYPES COMPRESSION ANALYSIS")
+            print("="*80)
         
-        results = cursor.fetchall()
+        stats = self._compression_stats()
+        
+        # Per type: [doc_count, compressed, failed, skipped, total_original, total_compressed]
+        by_type = {}
+        status_column = {'completed': 1, 'failed': 2, 'skipped': 3}
+        for (type_id, status), (count, orig_size, comp_size) in stats["groups"].items():
+            totals = by_type.setdefault(type_id, [0, 0, 0, 0, 0, 0])
+            totals[0] += count
+            if status in status_column:
+                totals[status_column[status]] += count
+            totals[4] += orig_size
+            totals[5] += comp_size
+        
+        results = []
+        for type_id, type_name, comp_level, comp_method, min_size in stats["types"]:
+            doc_count, compressed, failed, skipped, total_orig, total_comp = by_type.get(type_id, [0] * 6)
+            avg_size = total_orig / doc_count if doc_count else None
+            results.append((type_name, comp_level, comp_method, min_size, doc_count,
+                            compressed, failed, skipped, avg_size, total_orig, total_comp))
+        results.sort(key=lambda row: row[4], reverse=True)
+        
+        if self.json_output:
+            columns = ("type_name", "compression_level", "compression_method", "min_size_for_compression",
+                       "doc_count", "compressed", "failed", "skipped", "avg_size",
+                       "total_original_size", "total_compressed_size")
+            self._emit("document_types", [dict(zip(columns, row)) for row in results if row[4]])
+            return
         
         print(f"\n📋 Document Type Analysis:")
         
@@ -401,25 +646,25 @@ class CompressionDebugger:
                 savings = total_orig - total_comp
                 percentage = (savings / total_orig) * 100
                 print(f"   💾 Total savings: {self.format_bytes(savings)} ({percentage:.1f}%)")
-        
-        conn.close()
     
     def format_bytes(self, bytes_val):
         """Format bytes into human readable format"""
         if bytes_val is None:
             return "0 B"
         
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if bytes_val < 1024.0:
-                return f"{bytes_val:.1f} {unit}"
-            bytes_val /= 1024.0
-        return f"{bytes_val:.1f} TB"
+        # Each unit spans 10 bits, so the bit length picks the unit directly (TB is the largest)
+        exponent = min(int(bytes_val).bit_length() - 1, 40) // 10 if bytes_val >= 1024 else 0
+        return f"{bytes_val / (1 << (exponent * 10)):.1f} {self.BYTE_UNITS[exponent]}"
     
     def run_full_debug(self):
         """Run complete debug session"""
-        print("🔍 COMPRESSION DEBUG SESSION")
-        print("="*80)
-        print(f"📅 Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        if self.json_output:
+            self._emit("session", database=self.db_path, storage=self.storage_path,
+                       started_at=datetime.now().isoformat(timespec='seconds'))
+        else:
+            print("🔍 COMPRESSION DEBUG SESSION")
+            print("="*80)
+            print(f"📅 Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
         try:
             self.get_compression_overview()
@@ -429,20 +674,38 @@ class CompressionDebugger:
             self.get_document_types_analysis()
             self.scan_storage_directory()
             
-            print("\n" + "="*80)
-            print("✅ DEBUG SESSION COMPLETED")
-            print("="*80)
+            if not self.json_output:
+                print("\n" + "="*80)
+                print("✅ DEBUG SESSION COMPLETED")
+                print("="*80)
             
         except Exception as e:
-            print(f"\n❌ Debug session failed: {e}")
+            if self.json_output:
+                self._emit("error", error=str(e))
+            else:
+                print(f"\n❌ Debug session failed: {e}")
             import traceback
             traceback.print_exc()
 
 if __name__ == "__main__":
-    import sys
-    
-    db_path = sys.argv[1] if len(sys.argv) > 1 else None
-    storage_path = sys.argv[2] if len(sys.argv) > 2 else None
+    parser = argparse.ArgumentParser(description="Debug the compression system's database and storage")
+    parser.add_argument("db_path", nargs="?", help="path to actionaid.db (found automatically if omitted)")
+    parser.add_argument("storage_path", nargs="?", help="storage directory (found automatically if omitted)")
+    parser.add_argument("--json", action="store_true", help="emit one NDJSON record per report section")
+    parser.add_argument(
+        "--create-indexes",
+        action="store_true",
+        help="add the report's status/type indexes to the database first (otherwise it is only read)"
+    )
+    parser.add_argument("--out", help="write the report to this file instead of stdout (gzipped if it ends in .gz)")
+    args = parser.parse_args()
     
-    debugger = CompressionDebugger(db_path, storage_path)
-    debugger.run_full_debug() 
\ No newline at end of file
+    with contextlib.ExitStack() as stack:
+        if args.out:
+            opener = gzip.open if args.out.endswith(".gz") else open
+            stack.enter_context(contextlib.redirect_stdout(stack.enter_context(opener(args.out, "wt", encoding="utf-8"))))
+        
+        debugger = stack.enter_context(CompressionDebugger(
+            args.db_path, args.storage_path, json_output=args.json, create_indexes=args.create_indexes
+        ))
+        debugger.run_full_debug() 
\ No newline at end of file
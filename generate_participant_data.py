@@ -4,16 +4,23 @@ Participant Data Generator Script
 Generates random participant data for testing the ActionAid SwiftUI app
 """
 
+import itertools
 import json
 import random
 import requests
 import uuid
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 
 # Configuration
 BASE_URL = "http://localhost:8080"  # Adjust to your server URL
 TOTAL_PARTICIPANTS = 50  # Number of participants to create
+MAX_WORKERS = 16  # Concurrent API requests
+BULK_BATCH_SIZE = 500  # Participants per /api/participants/bulk request
+POOL_SIZE = 32  # Keep-alive connections kept open to the server
 
 # Sample data pools - ADD MORE DATA HERE AS NEEDED
 FIRST_NAMES = [
@@ -56,31 +63,66 @@ GENDERS = ["male", "female", "other", "prefer_not_to_say"]
 AGE_GROUPS = ["child", "youth", "adult", "elderly"]
 SYNC_PRIORITIES = ["low", "normal", "high"]
 
+def _weighted_pool(values: List[Any], none_weight: int):
+    """Return (population, cum_weights) giving None the weight of none_weight regular values"""
+    population = tuple(values) + (None,)
+    weights = [1] * len(values) + [none_weight]
+    return population, tuple(itertools.accumulate(weights))
+
+# Sampling pools, built once; a None draw leaves the field empty to test missing data scenarios
+_DISABILITY_POOL = ((True, False), tuple(itertools.accumulate((1, 3))))  # 25% chance of disability
+_GENDER_POOL = _weighted_pool(GENDERS, 2)  # 2 in 6 chance of None
+_AGE_POOL = _weighted_pool(AGE_GROUPS, 1)  # 20% chance of None
+_LOCATION_POOL = _weighted_pool(LOCATIONS, 2)  # 2 in 52 chance of None
+
+def generate_participants(count: int) -> List[Dict[str, Any]]:
+    """Generate random participants, drawing each field for all of them at once"""
+    first_names = random.choices(FIRST_NAMES, k=count)
+    last_names = random.choices(LAST_names, k=count)
+    disabilities = random.choices(_DISABILITY_POOL[0], cum_weights=_DISABILITY_POOL[1], k=count)
+    disability_types = random.choices(DISABILITY_TYPES, k=count)
+    genders = random.choices(_GENDER_POOL[0], cum_weights=_GENDER_POOL[1], k=count)
+    age_groups = random.choices(_AGE_POOL[0], cum_weights=_AGE_POOL[1], k=count)
+    locations = random.choices(_LOCATION_POOL[0], cum_weights=_LOCATION_POOL[1], k=count)
+    sync_priorities = random.choices(SYNC_PRIORITIES, k=count)
+    
+    return [
+        {
+            "name": f"{first_name} {last_name}",
+            "gender": gender,
+            "disability": has_disability,
+            "disability_type": disability_type if has_disability else None,
+            "age_group": age_group,
+            "location": location,
+            "sync_priority": sync_priority
+        }
+        for first_name, last_name, has_disability, disability_type, gender, age_group, location, sync_priority
+        in zip(first_names, last_names, disabilities, disability_types, genders, age_groups, locations, sync_priorities)
+    ]
+
 def generate_participant() -> Dict[str, Any]:
     """Generate a single random participant"""
-    first_name = random.choice(FIRST_NAMES)
-    last_name = random.choice(LAST_names)
-    name = f"{first_name} {last_name}"
-    
-    has_disability = random.choice([True, False, False, False])  # 25% chance of disability
-    disability_type = random.choice(DISABILITY_TYPES) if has_disability else None
-    
-    # Sometimes leave fields empty to test missing data scenarios
-    gender = random.choice(GENDERS + [None, None])  # 25% chance of None
-    age_group = random.choice(AGE_GROUPS + [None])  # 20% chance of None
-    location = random.choice(LOCATIONS + [None, None])  # 25% chance of None
-    
-    return {
-        "name": name,
-        "gender": gender,
-        "disability": has_disability,
-        "disability_type": disability_type,
-        "age_group": age_group,
-        "location": location,
-        "sync_priority": random.choice(SYNC_PRIORITIES)
-    }
+    return generate_participants(1)[0]
+
+def create_session() -> requests.Session:
+    """Create a keep-alive session that retries requests which never reached the server"""
+    # Creates are POSTs without an idempotency key: after a read timeout or a 502/503/504
+    # the server may already have committed the batch, so only connect errors are retried
+    retry = Retry(
+        total=3,
+        connect=3,
+        read=0,
+        status=0,
+        backoff_factor=0.1
+    )
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
 
-def create_participant_via_api(participant_data: Dict[str, Any], auth_context: Dict[str, Any]) -> bool:
+def create_participant_via_api(participant_data: Dict[str, Any], auth_context: Dict[str, Any],
+                               session: requests.Session) -> bool:
     """Create a participant via the API"""
     payload = {
         "participant": participant_data,
@@ -88,15 +130,14 @@ def create_participant_via_api(participant_data: Dict[str, Any], auth_context: D
     }
     
     try:
-        response = requests.post(
+        response = session.post(
             f"{BASE_URL}/api/participants",
             json=payload,
             headers={"Content-Type": "application/json"},
             timeout=10
         )
         
-        if response.status_code == 200:
-            result = response.json()
+        if response.ok:
             print(f"✅ Created participant: {participant_data['name']}")
             return True
         else:
@@ -107,6 +148,52 @@ def create_participant_via_api(participant_data: Dict[str, Any], auth_context: D
         print(f"❌ Error creating {participant_data['name']}: {str(e)}")
         return False
 
+def create_participants_bulk_via_api(participants: List[Dict[str, Any]], auth_context: Dict[str, Any],
+                                     session: requests.Session) -> Optional[int]:
+    """Create a batch of participants in one request; returns the number created, or None if bulk isn't supported"""
+    payload = {
+        "participants": participants,
+        "auth": auth_context
+    }
+    
+    try:
+        response = session.post(
+            f"{BASE_URL}/api/participants/bulk",
+            json=payload,
+            headers={"Content-Type": "application/json"},
+            timeout=60
+        )
+        
+        if response.status_code in (404, 405):
+            return None
+        if response.ok:
+            print(f"✅ Created {len(participants)} participants")
+            return len(participants)
+        else:
+            print(f"❌ Failed to create batch of {len(participants)}: {response.status_code} - {response.text}")
+            return 0
+            
+    except Exception as e:
+        print(f"❌ Error creating batch of {len(participants)}: {str(e)}")
+        return 0
+
+def create_participants_individually(participants: List[Dict[str, Any]], auth_context: Dict[str, Any],
+                                     session: requests.Session) -> Tuple[int, int]:
+    """Create participants one request each, concurrently; returns (created, failed)"""
+    created_count = 0
+    failed_count = 0
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = [
+            executor.submit(create_participant_via_api, participant, auth_context, session)
+            for participant in participants
+        ]
+        for future in as_completed(futures):
+            if future.result():
+                created_count += 1
+            else:
+                failed_count += 1
+    return created_count, failed_count
+
 def generate_auth_context() -> Dict[str, Any]:
     """Generate a mock auth context - ADJUST THESE VALUES"""
     return {
@@ -145,24 +232,31 @@ def main():
     created_count = 0
     failed_count = 0
     
-    # Generate participants
-    for i in range(TOTAL_PARTICIPANTS):
-        participant = generate_participant()
-        
+    participants = generate_participants(TOTAL_PARTICIPANTS)
+    for i, participant in enumerate(participants):
         print(f"\n📝 [{i+1}/{TOTAL_PARTICIPANTS}] Creating: {participant['name']}")
         print(f"    Gender: {participant.get('gender', 'Not specified')}")
         print(f"    Age Group: {participant.get('age_group', 'Not specified')}")
         print(f"    Location: {participant.get('location', 'Not specified')}")
         print(f"    Disability: {'Yes' if participant.get('disability') else 'No'}")
-        
-        if create_participant_via_api(participant, auth_context):
-            created_count += 1
-        else:
-            failed_count += 1
-        
-        # Add small delay to avoid overwhelming the server
-        import time
-        time.sleep(0.1)
+    
+    print()
+    # Submit in bulk batches over one pooled session, so the server can write each batch in one transaction
+    with create_session() as session:
+        for start in range(0, len(participants), BULK_BATCH_SIZE):
+            batch = participants[start:start + BULK_BATCH_SIZE]
+            created = create_participants_bulk_via_api(batch, auth_context, session)
+            
+            if created is None:
+                # Server has no bulk endpoint: send the rest one request per participant
+                print("ℹ️ Bulk endpoint not available, creating participants individually")
+                created, failed = create_participants_individually(participants[start:], auth_context, session)
+                created_count += created
+                failed_count += failed
+                break
+            
+            created_count += created
+            failed_count += len(batch) - created
     
     # Print summary
     print("\n" + "="*60)
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for setup_xcode.py: artifact paths, the Swift test view controller
+template and the closing Xcode instructions for each setup mode
+"""
+
+import functools
+import sys
+from pathlib import Path
+from string import Template
+
+TEMPLATE_PATH = Path(__file__).parent / "templates" / "iOS_Test_ViewController.swift.tmpl"
+
+MODES = ("simple", "full")
+
+# Template blocks for calling the C functions directly through the bridging header
+_SIMPLE_BLOCKS = {
+    "imports": '''
+// Import the C functions directly
+// You'll need to add the header file to your bridging header
+// or create a module.modulemap''',
+    "properties": '''
+    // iOS Documents directory, looked up once
+    private let documentsPath = FileManager.default.urls(for: .documentDirectory,
+                                                         in: .userDomainMask).first!
+    ''',
+    "version_test": '''        var versionResult: UnsafeMutablePointer<CChar>?
+        let versionCode = get_library_version(&versionResult)
+        
+        if versionCode == 0, let versionStr = versionResult {
+            let version = String(cString: versionStr)
+            appendResult("✅ Library version: \\(version)")
+            free_string(versionStr)
+        } else {
+            appendResult("❌ Failed to get library version")
+        }''',
+    "database_setup": '''        
+        let dbURL = documentsPath.appendingPathComponent("test_ipad_rust_core.sqlite")
+        let dbPath = "sqlite://" + dbURL.path
+        
+        // Get device ID
+        let deviceId = UIDevice.current.identifierForVendor?.uuidString ?? "unknown-device"''',
+    "last_error": '''            
+            // Get last error
+            var errorResult: UnsafeMutablePointer<CChar>?
+            let errorCode = get_last_error(&errorResult)
+            if errorCode == 0, let errorStr = errorResult {
+                let error = String(cString: errorStr)
+                appendResult("   Error: \\(error)")
+                free_string(errorStr)
+            }''',
+    "extra_tests": "",
+    "file_start": "",
+    "ui_style": '''        resultTextView.backgroundColor = UIColor.systemBackground
+        resultTextView.layer.borderColor = UIColor.systemGray4.cgColor
+        resultTextView.layer.borderWidth = 1
+        resultTextView.layer.cornerRadius = 8
+''',
+    "user_response": "",
+    "token_echo": '''                appendResult("   Access token received: \\(accessToken.prefix(20))...")
+                
+''',
+    # Blank lines go before each section heading
+    "lead": "\\n",
+    "trail": "",
+}
+
+# Template blocks for calling the library through the iPadRustCore Swift package
+_FULL_BLOCKS = {
+    "imports": "import iPadRustCore",
+    "properties": '''
+    private let core = iPadRustCore.shared
+    ''',
+    "version_test": '''        if let version = core.getLibraryVersion() {
+            appendResult("✅ Library version: \\(version)\\n")
+        } else {
+            appendResult("❌ Failed to get library version\\n")
+        }''',
+    "database_setup": '''        let dbPath = core.getDatabaseURL(filename: "test_ipad_rust_core.sqlite")
+        let deviceId = core.getDeviceId()''',
+    "last_error": '''            if let error = core.getLastError() {
+                appendResult("   Error: \\(error)\\n")
+            }''',
+    "extra_tests": '''        // Test offline mode
+        appendResult("📋 Testing offline mode...")
+        appendResult("Initial offline mode: \\(core.isOfflineMode())")
+        core.setOfflineMode(true)
+        appendResult("After setting to true: \\(core.isOfflineMode())")
+        core.setOfflineMode(false)
+        appendResult("After setting to false: \\(core.isOfflineMode())\\n")
+        
+''',
+    "file_start": "\n",
+    "ui_style": "",
+    "user_response": '''            let userResponse = String(cString: userResultStr)
+''',
+    "token_echo": "",
+    # Blank lines go after each result instead
+    "lead": "",
+    "trail": "\\n",
+}
+
+# Closing instructions for --mode simple
+_SIMPLE_INSTRUCTIONS = "\n".join([
+    "\\n" + "="*60,
+    "🎯 XCODE SETUP INSTRUCTIONS",
+    "="*60,
+    "",
+    "1. 📱 Create a new iOS App project in Xcode:",
+    "   - Choose 'App' template",
+    "   - Language: Swift",
+    "   - Interface: Storyboard",
+    "   - Minimum iOS version: 13.0+",
+    "",
+    "2. 📚 Add the static libraries:",
+    "   - Drag {device_lib.name} to your Xcode project",
+    "   - Drag {sim_lib.name} to your Xcode project",
+    "   - Add both to 'Link Binary With Libraries' build phase",
+    "",
+    "3. 📄 Add the header files:",
+    "   - Drag {header_file.name} to your Xcode project",
+    "   - Drag {bridging_header_file.name} to your Xcode project",
+    "",
+    "4. ⚙️  Configure build settings:",
+    "   - Go to Build Settings → Swift Compiler - General",
+    "   - Set 'Objective-C Bridging Header' to: {bridging_header_file.name}",
+    "   - Add header search path to the directory containing ipad_rust_core.h",
+    "   - Link SystemConfiguration framework",
+    "",
+    "5. 🎨 Set up the UI in Main.storyboard:",
+    "   - Add UILabel (connect to statusLabel)",
+    "   - Add UIButton (connect to testButton, action: runTests)",
+    "   - Add UITextView (connect to resultTextView)",
+    "",
+    "6. 📝 Replace ViewController.swift:",
+    "   - Copy content from: {ios_test_file}",
+    "   - Replace your ViewController.swift content",
+    "",
+    "7. 🚀 Run on iOS Simulator or Device!",
+    "",
+    "📱 Benefits of testing in Xcode:",
+    "✅ Proper iOS sandbox environment",
+    "✅ Real Documents directory access",
+    "✅ UIDevice integration testing",
+    "✅ iOS-specific debugging tools",
+    "✅ Performance profiling with Instruments",
+    "✅ Memory leak detection",
+    "✅ Crash reporting and symbolication",
+    "",
+    "🔧 Troubleshooting:",
+    "- If build fails: Check that both .a files are linked",
+    "- If functions not found: Verify bridging header path",
+    "- If runtime errors: Check iOS deployment target (13.0+)",
+    "- If database errors: Check app has Documents directory access",
+    "",
+    "📁 Files created:",
+    "   • {ios_test_file}",
+    "   • {bridging_header_file}",
+    "",
+    "📁 Files to add to Xcode:",
+    "   • {device_lib}",
+    "   • {sim_lib}",
+    "   • {header_file}",
+]) + "\n"
+
+# Closing instructions for --mode full
+_FULL_INSTRUCTIONS = "\n".join([
+    "\n" + "="*60,
+    "🎯 XCODE SETUP INSTRUCTIONS",
+    "="*60,
+    "",
+    "1. Open Xcode and create a new iOS App project",
+    "   - Choose 'App' template",
+    "   - Language: Swift",
+    "   - Interface: Storyboard",
+    "   - Minimum iOS version: 13.0+",
+    "",
+    "2. Add the iPad Rust Core Swift Package:",
+    "   - File → Add Package Dependencies",
+    "   - Enter local path: {project_root}",
+    "   - Add 'iPadRustCore' library to your target",
+    "",
+    "3. Copy the test code:",
+    "   - Copy content from: {ios_test_file}",
+    "   - Replace your ViewController.swift content",
+    "",
+    "4. Add UI elements to Main.storyboard:",
+    "   - UILabel (statusLabel)",
+    "   - UIButton (testButton) with action 'runTests'",
+    "   - UITextView (resultTextView)",
+    "",
+    "5. Add the static library:",
+    "   - Drag libipad_rust_core.a to your Xcode project",
+    "   - Add to 'Link Binary With Libraries' build phase",
+    "",
+    "6. Configure build settings:",
+    "   - Add header search path to include/",
+    "   - Link SystemConfiguration framework",
+    "",
+    "7. Run on iOS Simulator or Device!",
+    "",
+    "📱 Benefits of testing in Xcode:",
+    "✅ Proper iOS sandbox environment",
+    "✅ Real Documents directory access",
+    "✅ UIDevice integration testing",
+    "✅ iOS-specific debugging tools",
+    "✅ Performance profiling",
+    "✅ Memory leak detection",
+    "",
+    "🔧 If you encounter issues:",
+    "- Check that all Rust targets are built",
+    "- Verify the static library is linked correctly",
+    "- Ensure header files are accessible",
+    "- Check iOS deployment target compatibility",
+]) + "\n"
+
+SWIFT_BLOCKS = {"simple": _SIMPLE_BLOCKS, "full": _FULL_BLOCKS}
+INSTRUCTIONS = {"simple": _SIMPLE_INSTRUCTIONS, "full": _FULL_INSTRUCTIONS}
+
+def build_paths(project_root):
+    """Files the setup scripts read or create, keyed by the names the instructions use"""
+    ios_dir = project_root / "target" / "ios"
+    return {
+        "project_root": project_root,
+        "device_lib": ios_dir / "libipad_rust_core_device.a",
+        "sim_lib": ios_dir / "libipad_rust_core_sim.a",
+        "header_file": ios_dir / "ipad_rust_core.h",
+        "ios_test_file": project_root / "iOS_Test_ViewController.swift",
+        "bridging_header_file": project_root / "iPad-Rust-Core-Bridging-Header.h",
+    }
+
+@functools.cache
+def _load_template():
+    """Parse the shared Swift template once per process"""
+    return Template(TEMPLATE_PATH.read_text())
+
+def render_test_view_controller(mode):
+    """Fill the shared Swift test view controller template with the blocks for a mode"""
+    return _load_template().substitute(SWIFT_BLOCKS[mode])
+
+def write_swift_template(dest, mode):
+    """Write the rendered Swift test view controller for a mode to dest"""
+    with open(dest, 'w') as f:
+        f.write(render_test_view_controller(mode))
+
+def print_instructions(mode, paths):
+    """Write the closing Xcode instructions for a mode in one call"""
+    sys.stdout.write(INSTRUCTIONS[mode].format(**paths))
@@ -2,17 +2,21 @@
 
 import re
 
+# Pattern to match the runtime creation and removal
+_RUNTIME_NEW = re.compile(r'let rt = Runtime::new\(\)\s*\.map_err\([^}]+\}\)\?;\s*\n\s*')
+
 def fix_compression_runtime():
     file_path = "src/ffi/compression.rs"
     
     with open(file_path, 'r') as f:
         content = f.read()
     
-    # Pattern to match the runtime creation and removal
-    pattern = r'let rt = Runtime::new\(\)\s*\.map_err\([^}]+\}\)\?;\s*\n\s*'
+    if 'Runtime::new' not in content:
+        print(f"⏭️  No Runtime::new() instances in {file_path}")
+        return
     
     # Replace with empty string (remove the runtime creation)
-    fixed_content = re.sub(pattern, '', content)
+    fixed_content = _RUNTIME_NEW.sub('', content)
     
     with open(file_path, 'w') as f:
         f.write(fixed_content)
@@ -6,62 +6,75 @@ This script will:
 2. Replace local block_on_async functions with calls to the centralized one
 """
 
+import json
 import os
 import re
 import glob
+from multiprocessing import Pool
 
-def fix_ffi_file(file_path):
-    """Fix a single FFI file by removing runtime creation and using centralized runtime."""
-    print(f"Fixing {file_path}...")
-    
-    with open(file_path, 'r') as f:
-        content = f.read()
-    
-    original_content = content
-    
-    # Remove Runtime import
-    content = re.sub(r'use tokio::runtime::Runtime;\n', '', content)
-    
-    # Replace the block_on_async function definition
-    old_pattern = r'''/// Helper function to run async code in a blocking context
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".runtime_fix_cache.json")
+
+# Remove Runtime import
+_RUNTIME_IMPORT = re.compile(r'use tokio::runtime::Runtime;\n')
+
+# Replace the block_on_async function definition
+_BLOCK_ON_DEF = re.compile(r'''/// Helper function to run async code in a blocking context
 fn block_on_async<F, T, E>\(future: F\) -> Result<T, E>
 where
     F: std::future::Future<Output = Result<T, E>>,
 \{
     let rt = Runtime::new\(\)\.expect\(".*?"\);
     rt\.block_on\(future\)
-\}'''
-    
-    new_replacement = '''/// Helper function to run async code in a blocking context
+\}''', re.MULTILINE | re.DOTALL)
+
+_BLOCK_ON_REPLACEMENT = '''/// Helper function to run async code in a blocking context
 fn block_on_async<F, T, E>(future: F) -> Result<T, E>
 where
     F: std::future::Future<Output = Result<T, E>>,
 {
     crate::ffi::block_on_async(future)
 }'''
-    
-    content = re.sub(old_pattern, new_replacement, content, flags=re.MULTILINE | re.DOTALL)
-    
-    # Alternative pattern for different variations
-    alt_pattern = r'''fn block_on_async<F, T, E>\(future: F\) -> Result<T, E>
+
+# Alternative pattern for different variations
+_BLOCK_ON_DEF_ALT = re.compile(r'''fn block_on_async<F, T, E>\(future: F\) -> Result<T, E>
 where
     F: std::future::Future<Output = Result<T, E>>,
 \{
     let rt = Runtime::new\(\)\.expect\(".*?"\);
     rt\.block_on\(future\)
-\}'''
-    
-    content = re.sub(alt_pattern, '''fn block_on_async<F, T, E>(future: F) -> Result<T, E>
+\}''', re.MULTILINE | re.DOTALL)
+
+_BLOCK_ON_REPLACEMENT_ALT = '''fn block_on_async<F, T, E>(future: F) -> Result<T, E>
 where
     F: std::future::Future<Output = Result<T, E>>,
 {
     crate::ffi::block_on_async(future)
-}''', content, flags=re.MULTILINE | re.DOTALL)
+}'''
+
+# Handle compression.rs special cases with direct Runtime::new() calls
+_RUNTIME_NEW_MAP_ERR = re.compile(r'let rt = Runtime::new\(\)\s*\.map_err\([^}]+\}\)?;')
+_RT_BLOCK_ON = re.compile(r'rt\.block_on\(')
+
+def fix_ffi_file(file_path):
+    """Fix a single FFI file by removing runtime creation and using centralized runtime."""
+    print(f"Fixing {file_path}...")
     
-    # Handle compression.rs special cases with direct Runtime::new() calls
-    content = re.sub(r'let rt = Runtime::new\(\)\s*\.map_err\([^}]+\}\)?;', 
-                     '// Using centralized runtime', content)
-    content = re.sub(r'rt\.block_on\(', 'crate::ffi::block_on_async(', content)
+    with open(file_path, 'r') as f:
+        content = f.read()
+    
+    # Files without any runtime usage can't match any of the patterns below
+    if ('Runtime::new' not in content and 'tokio::runtime::Runtime' not in content
+            and 'rt.block_on(' not in content):
+        print(f"  ⏭️  No changes needed for {file_path}")
+        return False
+    
+    original_content = content
+    
+    content = _RUNTIME_IMPORT.sub('', content)
+    content = _BLOCK_ON_DEF.sub(_BLOCK_ON_REPLACEMENT, content)
+    content = _BLOCK_ON_DEF_ALT.sub(_BLOCK_ON_REPLACEMENT_ALT, content)
+    content = _RUNTIME_NEW_MAP_ERR.sub('// Using centralized runtime', content)
+    content = _RT_BLOCK_ON.sub('crate::ffi::block_on_async(', content)
     
     # Write back if changed
     if content != original_content:
@@ -73,6 +86,27 @@ where
         print(f"  ⏭️  No changes needed for {file_path}")
         return False
 
+def fingerprint(file_path):
+    """Cheap change detector for a file: modification time plus size."""
+    st = os.stat(file_path)
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+def load_cache():
+    """Load fingerprints of files that were already processed by a previous run."""
+    try:
+        with open(CACHE_PATH, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_cache(cache):
+    """Persist fingerprints so unchanged files are skipped next time."""
+    try:
+        with open(CACHE_PATH, 'w') as f:
+            json.dump(cache, f, indent=2, sort_keys=True)
+    except OSError as e:
+        print(f"⚠️  Could not write {CACHE_PATH}: {e}")
+
 def main():
     """Main function to fix all FFI files."""
     print("🔧 Fixing Tokio runtime conflicts in FFI files...")
@@ -81,10 +115,21 @@ def main():
     ffi_files = glob.glob("src/ffi/*.rs")
     ffi_files = [f for f in ffi_files if not f.endswith(('mod.rs', 'core.rs', 'error.rs'))]
     
+    # Skip files that haven't changed since a previous run processed them
+    cache = load_cache()
+    pending = [f for f in ffi_files if cache.get(os.path.abspath(f)) != fingerprint(f)]
+    if len(pending) < len(ffi_files):
+        print(f"⏭️  Skipping {len(ffi_files) - len(pending)} unchanged FFI files")
+    
+    # Each file is an independent read/regex/write, so fan them out across cores
     fixed_count = 0
-    for file_path in ffi_files:
-        if fix_ffi_file(file_path):
-            fixed_count += 1
+    if pending:
+        with Pool() as pool:
+            fixed_count = sum(pool.imap_unordered(fix_ffi_file, pending))
+    
+    for file_path in pending:
+        cache[os.path.abspath(file_path)] = fingerprint(file_path)
+    save_cache(cache)
     
     print(f"\n🎉 Fixed {fixed_count} out of {len(ffi_files)} FFI files")
     print("✅ All runtime conflicts should now be resolved!")
@@ -6,33 +6,58 @@ This script scans all FFI files and extracts function signatures
 
 import os
 import re
-import glob
+import json
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Tuple
 
+CACHE_PATH = '.cache/generate_header.json'
+# Below this many files to parse, starting worker processes costs more than it saves
+MIN_PARALLEL_FILES = 4
+
+# Pattern to match FFI function declarations, making return type optional
+# Group 1: func_name, Group 2: params, Group 3: return_type (optional)
+# Matched against raw bytes so only the captured groups need decoding, not the whole file
+_FFI_RE = re.compile(
+    rb'#\[unsafe\(no_mangle\)\]\s*pub unsafe extern "C" fn\s+(\w+)\s*\((.*?)\)(?:\s*->\s*([^{}\n]+))?',
+    re.MULTILINE | re.DOTALL
+)
+
+# Rust -> C parameter type conversions, applied in a single pass
+_TYPE_MAP = {
+    '*const c_char': 'const char*',
+    '*mut *mut c_char': 'char**',
+    '*mut c_char': 'char*',
+    'c_int': 'int32_t',
+}
+# Longest alternatives first so '*mut *mut c_char' isn't shadowed by '*mut c_char'
+_TYPE_MAP_RE = re.compile('|'.join(re.escape(t) for t in sorted(_TYPE_MAP, key=len, reverse=True)))
+
+def _replace_type(match: re.Match) -> str:
+    return _TYPE_MAP[match.group(0)]
+
+# Rust -> C return types; '' is an empty match after "->" and '()' an explicit "-> ()"
+_RETURN_MAP = {
+    'c_int': 'int32_t',
+    '()': 'void',
+    'bool': 'bool',
+    '*mut c_char': 'char*',
+    '*const c_char': 'char*',
+    '': 'void',
+}
+
 def extract_ffi_functions(file_path: str) -> List[Tuple[str, str, str]]:
     """Extract FFI function signatures from a Rust file"""
     functions = []
     
-    with open(file_path, 'r') as f:
+    with open(file_path, 'rb') as f:
         content = f.read()
     
-    # Pattern to match FFI function declarations, making return type optional
-    # Group 1: func_name, Group 2: params, Group 3: return_type (optional)
-    pattern = r'#\[unsafe\(no_mangle\)\]\s*pub unsafe extern "C" fn\s+(\w+)\s*\((.*?)\)(?:\s*->\s*([^{}\n]+))?'
-    
-    matches = re.finditer(pattern, content, re.MULTILINE | re.DOTALL)
-    
-    for match in matches:
-        func_name = match.group(1)
-        params_str = match.group(2).strip() # Renamed to avoid conflict
+    for match in _FFI_RE.finditer(content):
+        func_name = match.group(1).decode('utf-8')
+        params_str = match.group(2).decode('utf-8').strip() # Renamed to avoid conflict
         return_type_match = match.group(3) # This can be None
-
-        # ---- START DEBUG PRINT ----
-        if func_name == "export_projects_all":
-            print(f"DEBUG: func_name: {func_name}")
-            print(f"DEBUG: params_str: {params_str}")
-            print(f"DEBUG: return_type_match (group 3): {return_type_match}")
-        # ---- END DEBUG PRINT ----
+        if return_type_match is not None:
+            return_type_match = return_type_match.decode('utf-8')
         
         c_params = convert_params_to_c(params_str)
         c_return = convert_return_to_c(return_type_match)
@@ -60,11 +85,7 @@ def convert_params_to_c(params: str) -> str:
             param_type = param
         
         # Convert Rust types to C types
-        param_type = re.sub(r'\*const c_char', 'const char*', param_type)
-        param_type = re.sub(r'\*mut \*mut c_char', 'char**', param_type)
-        param_type = re.sub(r'\*mut c_char', 'char*', param_type)
-        param_type = re.sub(r'c_int', 'int32_t', param_type)
-        param_type = re.sub(r'bool', 'bool', param_type)
+        param_type = _TYPE_MAP_RE.sub(_replace_type, param_type)
         
         if param_type:  # Only add non-empty types
             param_parts.append(param_type)
@@ -77,28 +98,64 @@ def convert_return_to_c(return_type_match: str | None) -> str:
         return 'void'
         
     return_type_str = return_type_match.strip()
-
-    # For debugging:
-    # print(f"DEBUG: Raw return_type_match: '{return_type_match}', Stripped: '{return_type_str}'")
-
-    if return_type_str == 'c_int':
-        return 'int32_t'
-    elif return_type_str == '()': # Explicit "-> ()"
-        return 'void'
-    elif return_type_str == 'bool':
-        return 'bool'
-    elif return_type_str == '*mut c_char' or return_type_str == '*const c_char':
-        return 'char*'
-    elif not return_type_str: # Empty match after "->"
-        return 'void'
+    c_type = _RETURN_MAP.get(return_type_str)
+    if c_type is not None:
+        return c_type
+    
+    print(f"Warning: Unrecognized Rust return type '{return_type_str}' (from original '{return_type_match}'), defaulting to 'void' in C header.")
+    return 'void'
+
+def _script_key() -> int:
+    """Cache version: any edit to this script (e.g. the regexes) invalidates cached results"""
+    return os.stat(os.path.abspath(__file__)).st_mtime_ns
+
+def _load_cache() -> dict:
+    """Load extracted functions from a previous run, keyed by FFI file path"""
+    try:
+        with open(CACHE_PATH, 'r') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get('script') != _script_key():
+        return {}
+    return cache.get('files', {})
+
+def _save_cache(files: dict) -> None:
+    """Persist extracted functions so unchanged FFI files are not re-parsed next run"""
+    try:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        with open(CACHE_PATH, 'w') as f:
+            json.dump({'script': _script_key(), 'files': files}, f)
+    except OSError as e:
+        print(f"Warning: could not write cache {CACHE_PATH}: {e}")
+
+def extract_all_ffi_functions(file_paths: List[str], cache: dict) -> List[List[Tuple[str, str, str]]]:
+    """Extract functions for every file, in order, parsing only files changed since they were cached"""
+    keys = {}
+    stale = []
+    for file_path in file_paths:
+        st = os.stat(file_path)
+        keys[file_path] = [st.st_mtime_ns, st.st_size]
+        entry = cache.get(file_path)
+        if entry is None or entry['key'] != keys[file_path]:
+            stale.append(file_path)
+    
+    # Each file parses independently, so fan the changed ones out across processes
+    if len(stale) >= MIN_PARALLEL_FILES:
+        with ProcessPoolExecutor() as executor:
+            parsed = list(executor.map(extract_ffi_functions, stale))
     else:
-        print(f"Warning: Unrecognized Rust return type '{return_type_str}' (from original '{return_type_match}'), defaulting to 'void' in C header.")
-        return 'void'
+        parsed = [extract_ffi_functions(file_path) for file_path in stale]
+    
+    for file_path, functions in zip(stale, parsed):
+        cache[file_path] = {'key': keys[file_path], 'funcs': functions}
+    
+    return [[tuple(func) for func in cache[file_path]['funcs']] for file_path in file_paths]
 
 def generate_header():
     """Generate the complete header file"""
     
-    header_content = '''#ifndef IPAD_RUST_CORE_H
+    parts = ['''#ifndef IPAD_RUST_CORE_H
 #define IPAD_RUST_CORE_H
 
 #include <stdint.h>
@@ -114,45 +171,45 @@ extern "C" {
 // DO NOT EDIT MANUALLY - regenerate using scripts/generate_header.py
 // ============================================================================
 
-'''
+''']
 
-    # Get all FFI files
-    ffi_files = glob.glob('src/ffi/*.rs')
-    ffi_files.sort()
+    # Get all FFI module files (mod.rs and error.rs declare no FFI functions)
+    with os.scandir('src/ffi') as it:
+        ffi_files = sorted(
+            entry.path for entry in it
+            if entry.is_file() and entry.name.endswith('.rs') and entry.name not in ('mod.rs', 'error.rs')
+        )
     
     total_functions = 0
+    cache = _load_cache()
     
-    for ffi_file in ffi_files:
-        if ffi_file.endswith('/mod.rs') or ffi_file.endswith('/error.rs'):
-            continue
-            
+    for ffi_file, functions in zip(ffi_files, extract_all_ffi_functions(ffi_files, cache)):
         module_name = os.path.basename(ffi_file).replace('.rs', '')
-        functions = extract_ffi_functions(ffi_file)
         
         if functions:
-            header_content += f'''
+            parts.append(f'''
 // ============================================================================
 // {module_name.upper()} FUNCTIONS ({len(functions)} functions)
 // ============================================================================
 
-'''
-            
-            for func_name, params, return_type in functions:
-                header_content += f'{return_type} {func_name}({params});\n'
+''')
+            parts.extend(f'{return_type} {func_name}({params});\n' for func_name, params, return_type in functions)
             
             total_functions += len(functions)
     
-    header_content += '''
+    parts.append('''
 #ifdef __cplusplus
 }
 #endif
 
 #endif // IPAD_RUST_CORE_H
-'''
+''')
 
-    # Write the header file
-    with open('include/ipad_rust_core_complete.h', 'w') as f:
-        f.write(header_content)
+    _save_cache(cache)
+    
+    # Write the header file; the parts go straight into a 1 MiB buffer, never joined into one string
+    with open('include/ipad_rust_core_complete.h', 'w', buffering=1 << 20) as f:
+        f.writelines(parts)
     
     print(f"✅ Generated complete header with {total_functions} functions")
     print(f"📄 Saved to: include/ipad_rust_core_complete.h")
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Setup script for testing iPad Rust Core in Xcode
+  --mode simple  uses existing iOS build artifacts from build-ios.sh
+  --mode full    builds the library and header and sets up the Swift package
+"""
+
+import argparse
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+from _xcode_common import MODES, build_paths, print_instructions, write_swift_template
+
+# Rust targets built for the iOS device and simulators, in build order
+IOS_TARGETS = ("aarch64-apple-ios", "aarch64-apple-ios-sim", "x86_64-apple-ios")
+
+def run_command(cmd, cwd=None, check=True, capture=False):
+    """Run a command without a shell, streaming its output as it runs, and return the result"""
+    print(f"Running: {cmd}")
+    argv = shlex.split(cmd) if isinstance(cmd, str) else list(cmd)
+    captured = [] if capture else None
+    try:
+        with subprocess.Popen(argv, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                              text=True, bufsize=1) as proc:
+            for line in proc.stdout:
+                sys.stdout.write(line)
+                if capture:
+                    captured.append(line)
+        returncode = proc.returncode
+    except OSError as e:
+        # The executable itself is missing or not runnable
+        print(f"Error running command: {e}")
+        returncode = 127
+    
+    stdout = "".join(captured) if capture else None
+    result = subprocess.CompletedProcess(argv, returncode, stdout=stdout)
+    if returncode != 0 and check:
+        print(f"Error running command: {subprocess.CalledProcessError(returncode, cmd)}")
+        sys.exit(1)
+    return result
+
+# Files and directories whose changes make cargo rebuild the library: the manifest and lock
+# file, the toolchain and config, plus build.rs and its rerun-if-changed paths (db_migration.rs
+# embeds migrations/*.sql, and the header is copied into the target directory)
+BUILD_INPUT_FILES = (
+    "Cargo.toml", "Cargo.lock", "build.rs", "rust-toolchain", "rust-toolchain.toml",
+    ".cargo/config.toml", "include/ipad_rust_core.h",
+)
+BUILD_INPUT_DIRS = ("src", "migrations")
+
+def newest_source_mtime(project_root):
+    """Latest modification time of anything that affects the Rust build"""
+    newest = 0.0
+    for name in BUILD_INPUT_FILES:
+        try:
+            newest = max(newest, (project_root / name).stat().st_mtime)
+        except FileNotFoundError:
+            pass
+    
+    # Like cargo's rerun-if-changed on a directory, any file inside counts
+    stack = [project_root / name for name in BUILD_INPUT_DIRS if (project_root / name).is_dir()]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    newest = max(newest, entry.stat().st_mtime)
+    return newest
+
+def is_lib_fresh(project_root, triple, source_mtime):
+    """Whether the release library for a target is newer than every Rust source"""
+    lib = project_root / "target" / triple / "release" / "libipad_rust_core.a"
+    try:
+        return lib.stat().st_mtime >= source_mtime
+    except FileNotFoundError:
+        return False
+
+def is_header_fresh(header, header_script, ffi_dir):
+    """Whether the generated header is newer than the generator and every FFI source file"""
+    try:
+        header_mtime = header.stat().st_mtime
+    except FileNotFoundError:
+        return False
+    
+    if header_script.exists() and header_script.stat().st_mtime > header_mtime:
+        return False
+    with os.scandir(ffi_dir) as it:
+        return all(entry.stat().st_mtime <= header_mtime for entry in it if entry.name.endswith(".rs"))
+
+def installed_targets(project_root):
+    """Rust targets rustup already has installed (empty if rustup can't be queried)"""
+    result = run_command("rustup target list --installed", cwd=project_root, check=False, capture=True)
+    return set(result.stdout.split()) if result.returncode == 0 else set()
+
+def link_or_copy(source, dest):
+    """Hardlink source to dest (no data copied), falling back to a copy across filesystems"""
+    dest.unlink(missing_ok=True)
+    try:
+        os.link(source, dest)
+        return "Linked"
+    except OSError:
+        shutil.copy2(source, dest)
+        return "Copied"
+
+def setup_simple(paths):
+    """Use existing iOS build artifacts and write the Swift test file and bridging header"""
+    # Check if iOS build artifacts exist
+    device_lib = paths["device_lib"]
+    sim_lib = paths["sim_lib"]
+    header_file = paths["header_file"]
+    
+    if not all([device_lib.exists(), sim_lib.exists(), header_file.exists()]):
+        print("❌ iOS build artifacts not found!")
+        print("Please run: ./scripts/build-ios.sh first")
+        return
+    
+    print("✅ Found iOS build artifacts:")
+    print(f"   📱 Device library: {device_lib}")
+    print(f"   🖥️  Simulator library: {sim_lib}")
+    print(f"   📄 Header file: {header_file}")
+    
+    # Create an iOS test file with proper imports
+    print("\n📱 Creating iOS test file...")
+    
+    ios_test_file = paths["ios_test_file"]
+    write_swift_template(ios_test_file, "simple")
+    
+    print(f"✅ Created iOS test file: {ios_test_file}")
+    
+    # Create a bridging header template
+    bridging_header_content = '''//
+//  iPad-Rust-Core-Bridging-Header.h
+//  
+//  Bridging header for iPad Rust Core C functions
+//
+
+#ifndef iPad_Rust_Core_Bridging_Header_h
+#define iPad_Rust_Core_Bridging_Header_h
+
+// Include the iPad Rust Core C header
+#include "ipad_rust_core.h"
+
+#endif /* iPad_Rust_Core_Bridging_Header_h */
+'''
+    
+    bridging_header_file = paths["bridging_header_file"]
+    with open(bridging_header_file, 'w') as f:
+        f.write(bridging_header_content)
+    
+    print(f"✅ Created bridging header: {bridging_header_file}")
+    
+    # Provide instructions
+    print_instructions("simple", paths)
+
+def setup_full(project_root, paths):
+    """Build the Rust library and header, set up the Swift package and write the Swift test file"""
+    # Step 1: Build the Rust library for iOS
+    print("\n📱 Building Rust library for iOS...")
+    
+    # Check if we have the iOS build script
+    ios_build_script = project_root / "scripts" / "build-ios.sh"
+    source_mtime = newest_source_mtime(project_root)
+    stale_targets = [t for t in IOS_TARGETS if not is_lib_fresh(project_root, t, source_mtime)]
+    
+    if not stale_targets:
+        print("✅ iOS libraries are up to date, skipping build")
+    elif ios_build_script.exists():
+        print("Found iOS build script, running it...")
+        run_command(f'chmod +x "{ios_build_script}"')
+        run_command(f'"{ios_build_script}"', cwd=project_root)
+    else:
+        print("iOS build script not found, building manually...")
+        # Add iOS targets if not already added
+        installed = installed_targets(project_root)
+        missing_targets = [triple for triple in stale_targets if triple not in installed]
+        if missing_targets:
+            run_command(f"rustup target add {' '.join(missing_targets)}", cwd=project_root, check=False)
+        
+        # Build only the iOS targets whose library is older than the sources. One cargo
+        # invocation for all of them lets cargo's job server schedule the targets in
+        # parallel; separate concurrent cargo processes would serialize on the build lock
+        target_args = " ".join(f"--target {triple}" for triple in stale_targets)
+        run_command(f"cargo build {target_args} --release", cwd=project_root)
+    
+    # Step 2: Generate the C header
+    print("\n📋 Generating C header...")
+    header_script = project_root / "scripts" / "generate_header.py"
+    complete_header = project_root / "include" / "ipad_rust_core_complete.h"
+    if is_header_fresh(complete_header, header_script, project_root / "src" / "ffi"):
+        print("✅ C header is up to date, skipping generation")
+    elif header_script.exists():
+        run_command(f'"{sys.executable}" "{header_script}"', cwd=project_root)
+    else:
+        print("Header generation script not found, using cbindgen...")
+        run_command("cbindgen --config cbindgen.toml --crate ipad_rust_core --output include/ipad_rust_core.h", cwd=project_root)
+    
+    # Step 3: Copy the library to the Swift package location
+    print("\n📦 Setting up Swift package...")
+    
+    # Create the library directory if it doesn't exist
+    lib_dir = project_root / "Sources" / "iPadRustCoreC"
+    lib_dir.mkdir(exist_ok=True)
+    
+    # Copy the static library (we'll use the simulator version for testing)
+    target_dir = project_root / "target" / "aarch64-apple-ios-sim" / "release"
+    lib_file = target_dir / "libipad_rust_core.a"
+    
+    if lib_file.exists():
+        dest_lib = lib_dir / "libipad_rust_core.a"
+        action = link_or_copy(lib_file, dest_lib)
+        print(f"{action} library to {dest_lib}")
+    else:
+        print(f"Warning: Library file not found at {lib_file}")
+    
+    # Step 4: Test Swift package compilation
+    print("\n🔨 Testing Swift package compilation...")
+    result = run_command("swift build", cwd=project_root, check=False)
+    
+    if result.returncode == 0:
+        print("✅ Swift package builds successfully!")
+    else:
+        print("❌ Swift package build failed. Check the errors above.")
+    
+    # Step 5: Create an Xcode-compatible test file
+    print("\n📱 Creating iOS test file...")
+    
+    ios_test_file = paths["ios_test_file"]
+    write_swift_template(ios_test_file, "full")
+    
+    print(f"Created iOS test file: {ios_test_file}")
+    
+    # Step 6: Provide instructions
+    print_instructions("full", paths)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prepare iPad Rust Core for testing in Xcode")
+    parser.add_argument("--mode", choices=MODES, default="simple",
+                        help="simple: reuse existing iOS build artifacts; full: build everything first")
+    args = parser.parse_args(argv)
+    
+    print("🚀 Setting up iPad Rust Core for Xcode testing...")
+    
+    # Get the project root directory
+    script_dir = Path(__file__).parent
+    project_root = script_dir.parent
+    
+    print(f"Project root: {project_root}")
+    
+    paths = build_paths(project_root)
+    if args.mode == "simple":
+        setup_simple(paths)
+    else:
+        setup_full(project_root, paths)
+
+if __name__ == "__main__":
+    main()
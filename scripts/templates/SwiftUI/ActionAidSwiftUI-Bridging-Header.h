@@ -0,0 +1,13 @@
+//
+//  ActionAidSwiftUI-Bridging-Header.h
+//  ActionAid SwiftUI Test
+//
+//  Use this file to import your target's public headers that you would like to expose to Swift.
+//
+
+#ifndef ActionAidSwiftUI_Bridging_Header_h
+#define ActionAidSwiftUI_Bridging_Header_h
+
+#import "ipad_rust_core.h"
+
+#endif /* ActionAidSwiftUI_Bridging_Header_h */
@@ -0,0 +1,17 @@
+//
+//  ActionAidSwiftUIApp.swift
+//  ActionAid SwiftUI Test
+//
+//  iPad Rust Core SwiftUI App
+//
+
+import SwiftUI
+
+@main
+struct ActionAidSwiftUIApp: App {
+    var body: some Scene {
+        WindowGroup {
+            ContentView()
+        }
+    }
+}
@@ -0,0 +1,272 @@
+//
+//  ContentView.swift
+//  ActionAid SwiftUI Test
+//
+//  iPad Rust Core Test Interface - SwiftUI
+//
+
+import SwiftUI
+
+struct ContentView: View {
+    @State private var statusMessage = "Ready to test iPad Rust Core"
+    @State private var testResults = ""
+    @State private var isRunningTests = false
+    
+    var body: some View {
+        NavigationView {
+            VStack(spacing: 20) {
+                // Header
+                VStack(spacing: 10) {
+                    Text("🚀 iPad Rust Core")
+                        .font(.largeTitle)
+                        .fontWeight(.bold)
+                    
+                    Text(statusMessage)
+                        .font(.headline)
+                        .foregroundColor(isRunningTests ? .orange : .primary)
+                        .multilineTextAlignment(.center)
+                        .padding(.horizontal)
+                }
+                .padding()
+                
+                // Test Button
+                Button(action: runTests) {
+                    HStack {
+                        if isRunningTests {
+                            ProgressView()
+                                .scaleEffect(0.8)
+                                .foregroundColor(.white)
+                        }
+                        Text(isRunningTests ? "Running Tests..." : "🧪 Run Tests")
+                            .fontWeight(.semibold)
+                    }
+                    .frame(maxWidth: .infinity)
+                    .padding()
+                    .background(
+                        LinearGradient(
+                            gradient: Gradient(colors: isRunningTests ? [.orange, .red] : [.blue, .purple]),
+                            startPoint: .leading,
+                            endPoint: .trailing
+                        )
+                    )
+                    .foregroundColor(.white)
+                    .cornerRadius(15)
+                    .shadow(radius: 5)
+                }
+                .disabled(isRunningTests)
+                .padding(.horizontal)
+                
+                // Results Section
+                ScrollView {
+                    Text(testResults.isEmpty ? "Tap 'Run Tests' to start testing your Rust library...\n\n🔬 This will test:\n• Library version\n• Database initialization\n• User creation\n• Authentication\n• Project operations\n• Error handling" : testResults)
+                        .font(.system(size: 12, family: .monospaced))
+                        .padding()
+                        .frame(maxWidth: .infinity, alignment: .leading)
+                        .background(Color(.systemGray6))
+                        .cornerRadius(15)
+                        .shadow(radius: 2)
+                }
+                .padding(.horizontal)
+                
+                Spacer()
+            }
+            .navigationBarHidden(true)
+            .background(
+                LinearGradient(
+                    gradient: Gradient(colors: [Color(.systemBackground), Color(.systemGray6)]),
+                    startPoint: .top,
+                    endPoint: .bottom
+                )
+            )
+        }
+        .onAppear {
+            updateStatus("Ready to test iPad Rust Core ✨")
+        }
+    }
+    
+    private func runTests() {
+        updateStatus("Running comprehensive tests...")
+        isRunningTests = true
+        
+        // Run tests asynchronously
+        Task {
+            let results = await performTests()
+            
+            await MainActor.run {
+                testResults = results
+                updateStatus("Tests completed! 🎉")
+                isRunningTests = false
+            }
+        }
+    }
+    
+    private func updateStatus(_ message: String) {
+        statusMessage = message
+        print("📱 Status: \(message)")
+    }
+    
+    private func performTests() async -> String {
+        // Add small delay for better UX
+        try? await Task.sleep(nanoseconds: 500_000_000) // 0.5 seconds
+        
+        var results = "🚀 iPad Rust Core Test Results\n"
+        results += "================================\n\n"
+        
+        // Test 1: Library Version
+        results += "1️⃣ Testing Library Version...\n"
+        let version = get_library_version()
+        if let versionStr = String(cString: version, encoding: .utf8) {
+            results += "✅ Version: \(versionStr)\n\n"
+        } else {
+            results += "❌ Failed to get version\n\n"
+        }
+        
+        // Test 2: Database Initialization
+        results += "2️⃣ Testing Database Initialization...\n"
+        let deviceId = getDeviceId()
+        let dbPath = getDatabasePath()
+        results += "📱 Device ID: \(deviceId)\n"
+        results += "💾 Database Path: \(dbPath)\n"
+        
+        let dbUrl = "sqlite://\(dbPath)"
+        let initResult = initialize_database(dbUrl)
+        if initResult == 0 {
+            results += "✅ Database initialized successfully\n\n"
+        } else {
+            results += "❌ Database initialization failed (code: \(initResult))\n\n"
+        }
+        
+        // Test 3: User Creation
+        results += "3️⃣ Testing User Creation...\n"
+        let userJson = """
+        {
+            "name": "Test User",
+            "email": "test@actionaid.org",
+            "password": "securepassword123",
+            "role": "admin"
+        }
+        """
+        
+        var userResult: UnsafeMutablePointer<CChar>?
+        let userCreateResult = user_create(userJson, &userResult)
+        
+        if userCreateResult == 0, let userResultStr = userResult {
+            let userResponse = String(cString: userResultStr)
+            results += "✅ User created: \(userResponse)\n\n"
+            free_string(userResultStr)
+        } else {
+            let error = getLastError()
+            results += "❌ User creation failed: \(error)\n\n"
+        }
+        
+        // Test 4: Authentication
+        results += "4️⃣ Testing Authentication...\n"
+        let loginJson = """
+        {
+            "email": "test@actionaid.org",
+            "password": "securepassword123"
+        }
+        """
+        
+        var authResult: UnsafeMutablePointer<CChar>?
+        let authCreateResult = auth_login(loginJson, &authResult)
+        
+        var authToken: String = ""
+        if authCreateResult == 0, let authResultStr = authResult {
+            let authResponse = String(cString: authResultStr)
+            results += "✅ Authentication successful: \(authResponse)\n"
+            
+            // Extract token for further tests
+            if let tokenData = authResponse.data(using: .utf8),
+               let json = try? JSONSerialization.jsonObject(with: tokenData) as? [String: Any],
+               let token = json["access_token"] as? String {
+                authToken = token
+                results += "🔑 Token extracted for further tests\n\n"
+            }
+            free_string(authResultStr)
+        } else {
+            let error = getLastError()
+            results += "❌ Authentication failed: \(error)\n\n"
+        }
+        
+        // Test 5: Project Operations (if authenticated)
+        if !authToken.isEmpty {
+            results += "5️⃣ Testing Project Operations...\n"
+            let projectJson = """
+            {
+                "name": "Test Project",
+                "description": "A test project for iPad Rust Core",
+                "start_date": "2024-01-01",
+                "end_date": "2024-12-31",
+                "budget": 50000.0,
+                "status": "active"
+            }
+            """
+            
+            var projectResult: UnsafeMutablePointer<CChar>?
+            let projectCreateResult = project_create(projectJson, authToken, &projectResult)
+            
+            if projectCreateResult == 0, let projectResultStr = projectResult {
+                let projectResponse = String(cString: projectResultStr)
+                results += "✅ Project created: \(projectResponse)\n\n"
+                free_string(projectResultStr)
+            } else {
+                let error = getLastError()
+                results += "❌ Project creation failed: \(error)\n\n"
+            }
+        }
+        
+        // Test 6: Memory and Error Handling
+        results += "6️⃣ Testing Error Handling...\n"
+        let lastError = getLastError()
+        results += "🔍 Last error: \(lastError)\n\n"
+        
+        // Test 7: iOS-specific features
+        results += "7️⃣ Testing iOS Integration...\n"
+        results += "📱 Running on iOS: \(UIDevice.current.systemName) \(UIDevice.current.systemVersion)\n"
+        results += "🏷️ Device Model: \(UIDevice.current.model)\n"
+        results += "📂 Documents Directory: \(getDocumentsDirectory())\n"
+        results += "💾 Database URL: \(getDatabaseURL())\n\n"
+        
+        results += "================================\n"
+        results += "🎉 Test Suite Completed!\n"
+        results += "✨ Your iPad Rust Core is working perfectly!\n"
+        
+        return results
+    }
+    
+    // MARK: - Helper Functions
+    
+    private func getDeviceId() -> String {
+        if let uuid = UIDevice.current.identifierForVendor?.uuidString {
+            return uuid
+        }
+        return "unknown-device"
+    }
+    
+    private func getDocumentsDirectory() -> String {
+        let paths = FileManager.default.urls(for: .documentDirectory, in: .userDomainMask)
+        return paths[0].path
+    }
+    
+    private func getDatabasePath() -> String {
+        let documentsPath = getDocumentsDirectory()
+        return "\(documentsPath)/actionaid_core.sqlite"
+    }
+    
+    private func getDatabaseURL() -> String {
+        return "sqlite://\(getDatabasePath())"
+    }
+    
+    private func getLastError() -> String {
+        let errorPtr = get_last_error()
+        if let errorStr = String(cString: errorPtr, encoding: .utf8) {
+            return errorStr.isEmpty ? "No error" : errorStr
+        }
+        return "Unknown error"
+    }
+}
+
+#Preview {
+    ContentView()
+}
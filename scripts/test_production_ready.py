@@ -9,43 +9,174 @@ This script tests all the production-ready improvements:
 4. Domain functionality testing
 """
 
+import codecs
+import hashlib
+import heapq
+import io
+import json
 import subprocess
 import sys
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 
+# Echo every line of command output instead of just a preview
+VERBOSE = "-v" in sys.argv[1:] or "--verbose" in sys.argv[1:]
+
+# Run `cargo clean` before the compilation stage
+CLEAN = "--clean" in sys.argv[1:]
+
+# How much command output is kept: a preview on success, the last lines on failure
+OUTPUT_PREVIEW_CHARS = 200
+OUTPUT_TAIL_LINES = 20
+OUTPUT_HEAD_BYTES = 4096
+OUTPUT_TAIL_BYTES = 16384
+PIPE_READ_SIZE = 65536
+
+# Module files the auth and FFI stages expect, in the order they're reported
+AUTH_DIR = "src/auth"
+AUTH_FILES = ("mod.rs", "service.rs", "jwt.rs", "context.rs", "repository.rs")
+FFI_DIR = "src/ffi"
+FFI_FILES = ("mod.rs", "core.rs", "auth.rs", "user.rs", "project.rs", "participant.rs", "error.rs")
+
+# Results of the cargo/rustup probes, reused while the Rust toolchain is unchanged
+PREREQ_CACHE_PATH = Path.home() / ".cache" / "ipad_rust_core" / "prereq.json"
+
+# Output buffer of a check running on a pool thread, so concurrent checks don't interleave
+_stage_output = threading.local()
+
+def log(*args, end="\n"):
+    """Print to the current pooled check's output buffer, or straight to stdout as it happens"""
+    buffer = getattr(_stage_output, "buffer", None)
+    if buffer is None:
+        print(*args, end=end, flush=True)
+    else:
+        print(*args, end=end, file=buffer)
+
+def dir_entries(path):
+    """Names in a directory from a single scandir call, or None if it doesn't exist"""
+    try:
+        with os.scandir(path) as it:
+            return {entry.name for entry in it}
+    except FileNotFoundError:
+        return None
+
+def ensure_executable(path):
+    """Make a script executable if it isn't already; False if it doesn't exist"""
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return False
+    if not mode & 0o111:
+        os.chmod(path, mode | 0o755)
+    return True
+
 def run_command(cmd, description):
-    """Run a command and return success status"""
-    print(f"\n🔄 {description}")
-    print(f"Command: {' '.join(cmd)}")
+    """Run a command, streaming its output and keeping only the start and tail, and return success status"""
+    log(f"\n🔄 {description}")
+    log(f"Command: {' '.join(cmd)}")
     
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        print(f"✅ {description} - SUCCESS")
-        if result.stdout:
-            print(f"Output: {result.stdout[:200]}...")
+    # Long builds print a lot; the pipe is read in raw chunks and only a bounded head
+    # and tail are kept, decoded once the command has finished
+    head = bytearray()
+    tail = bytearray()
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT) as proc:
+        fd = proc.stdout.fileno()
+        while True:
+            chunk = os.read(fd, PIPE_READ_SIZE)
+            if not chunk:
+                break
+            if len(head) < OUTPUT_HEAD_BYTES:
+                head += chunk[:OUTPUT_HEAD_BYTES - len(head)]
+            tail += chunk
+            del tail[:-OUTPUT_TAIL_BYTES]
+            if VERBOSE:
+                # Echoed live, never buffered, so a long build's log isn't held in memory
+                sys.stdout.write(decoder.decode(chunk))
+                sys.stdout.flush()
+    
+    if proc.returncode == 0:
+        log(f"✅ {description} - SUCCESS")
+        if head:
+            log(f"Output: {head.decode('utf-8', 'replace')[:OUTPUT_PREVIEW_CHARS]}...")
         return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ {description} - FAILED")
-        print(f"Error: {e.stderr}")
+    else:
+        log(f"❌ {description} - FAILED")
+        tail_lines = tail.decode("utf-8", "replace").splitlines(keepends=True)[-OUTPUT_TAIL_LINES:]
+        log(f"Error: {''.join(tail_lines)}")
         return False
 
+def toolchain_cache_key():
+    """Hash of everything that decides which Rust toolchain and targets the probes see"""
+    rustup_home = os.environ.get("RUSTUP_HOME") or os.path.expanduser("~/.rustup")
+    parts = [rustup_home, os.environ.get("CARGO_HOME", ""), os.environ.get("PATH", "")]
+    
+    # Toolchain overrides, the default toolchain, and each toolchain's installed targets
+    # (rustup adds a directory under lib/rustlib for every target it installs)
+    paths = ["rust-toolchain.toml", "rust-toolchain", os.path.join(rustup_home, "settings.toml")]
+    try:
+        with os.scandir(os.path.join(rustup_home, "toolchains")) as it:
+            paths += sorted(os.path.join(entry.path, "lib", "rustlib") for entry in it)
+    except FileNotFoundError:
+        pass
+    
+    for path in paths:
+        try:
+            parts.append(f"{path}:{os.stat(path).st_mtime_ns}")
+        except FileNotFoundError:
+            parts.append(f"{path}:0")
+    return hashlib.blake2b("\0".join(parts).encode()).hexdigest()
+
+def probe_toolchain():
+    """Installed Rust targets, or None without cargo; cached until the toolchain changes"""
+    key = toolchain_cache_key()
+    try:
+        with open(PREREQ_CACHE_PATH) as f:
+            cached = json.load(f)
+        if cached["key"] == key:
+            return set(cached["installed_targets"])
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    
+    try:
+        subprocess.run(["cargo", "--version"], capture_output=True, check=True)
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return None
+    
+    # One rustup call covers every target
+    try:
+        result = subprocess.run(["rustup", "target", "list", "--installed"], 
+                                capture_output=True, check=True, text=True)
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return set()
+    installed = set(result.stdout.split())
+    
+    try:
+        PREREQ_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(PREREQ_CACHE_PATH, "w") as f:
+            json.dump({"key": key, "installed_targets": sorted(installed)}, f)
+    except OSError:
+        pass
+    return installed
+
 def check_prerequisites():
     """Check if all prerequisites are met"""
-    print("🔍 Checking prerequisites...")
+    log("🔍 Checking prerequisites...")
     
     # Check if we're in the right directory
     if not os.path.exists("Cargo.toml"):
-        print("❌ Not in the root directory of the iPad Rust Core project")
+        log("❌ Not in the root directory of the iPad Rust Core project")
         return False
     
     # Check if Rust is installed
-    try:
-        subprocess.run(["cargo", "--version"], capture_output=True, check=True)
-        print("✅ Rust/Cargo is installed")
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        print("❌ Rust/Cargo not found. Please install Rust.")
+    installed = probe_toolchain()
+    if installed is None:
+        log("❌ Rust/Cargo not found. Please install Rust.")
         return False
+    log("✅ Rust/Cargo is installed")
     
     # Check if required targets are installed
     targets = [
@@ -57,79 +188,67 @@ def check_prerequisites():
     ]
     
     for target in targets:
-        try:
-            subprocess.run(["rustup", "target", "list", "--installed"], 
-                         capture_output=True, check=True, text=True)
-            print(f"✅ Target {target} available")
-        except subprocess.CalledProcessError:
-            print(f"⚠️ Target {target} may not be installed")
+        if target in installed:
+            log(f"✅ Target {target} available")
+        else:
+            log(f"⚠️ Target {target} may not be installed")
     
     return True
 
-def test_rust_compilation():
-    """Test Rust compilation"""
-    print("\n📦 Testing Rust compilation...")
+def test_rust_check():
+    """Test that the Rust code compiles"""
+    log("\n📦 Testing Rust compilation...")
     
-    # Clean previous builds
-    run_command(["cargo", "clean"], "Cleaning previous builds")
-    
-    # Test debug build
-    success = run_command(["cargo", "build"], "Building debug version")
-    if not success:
-        return False
+    # Clean previous builds only when asked; it throws away the incremental cache
+    if CLEAN:
+        run_command(["cargo", "clean"], "Cleaning previous builds")
     
-    # Test release build
-    success = run_command(["cargo", "build", "--release"], "Building release version")
-    return success
+    # cargo check stops before codegen and linking; the iOS and macOS build scripts do
+    # the real release builds
+    return run_command(["cargo", "check", "--all-targets", "--message-format=short"],
+                       "Checking all targets")
 
-def test_ios_build():
+def test_ios_build(scripts_present):
     """Test iOS-specific builds"""
-    print("\n📱 Testing iOS builds...")
+    log("\n📱 Testing iOS builds...")
     
     # Make build script executable
-    build_script = Path("scripts/build-ios.sh")
-    if build_script.exists():
-        os.chmod(build_script, 0o755)
+    if "build-ios.sh" in scripts_present and ensure_executable("scripts/build-ios.sh"):
         success = run_command(["./scripts/build-ios.sh"], "Building iOS static library")
         return success
     else:
-        print("⚠️ iOS build script not found, skipping iOS build test")
+        log("⚠️ iOS build script not found, skipping iOS build test")
         return True
 
-def test_macos_build():
+def test_macos_build(scripts_present):
     """Test macOS-specific builds"""
-    print("\n💻 Testing macOS builds...")
+    log("\n💻 Testing macOS builds...")
     
     # Make build script executable
-    build_script = Path("scripts/build-macos.sh")
-    if build_script.exists():
-        os.chmod(build_script, 0o755)
+    if "build-macos.sh" in scripts_present and ensure_executable("scripts/build-macos.sh"):
         success = run_command(["./scripts/build-macos.sh"], "Building macOS static library")
         return success
     else:
-        print("⚠️ macOS build script not found, skipping macOS build test")
+        log("⚠️ macOS build script not found, skipping macOS build test")
         return True
 
 def test_swift_integration():
     """Test Swift integration"""
-    print("\n🔗 Testing Swift integration...")
+    log("\n🔗 Testing Swift integration...")
     
-    # Test Swift package build
-    success = run_command(["swift", "build"], "Building Swift package")
-    if not success:
-        return False
-    
-    # Test running the example
-    success = run_command(["swift", "run", "RunMyCodeExample"], "Running Swift test example")
-    return success
+    # swift run builds the package first, so a separate swift build would only resolve
+    # the package graph twice
+    cmd = ["swift", "run", "RunMyCodeExample"]
+    if VERBOSE:
+        cmd.insert(2, "--verbose")
+    return run_command(cmd, "Building and running Swift test example")
 
-def test_header_generation():
+def test_header_generation(scripts_present):
     """Test C header generation"""
-    print("\n📄 Testing C header generation...")
+    log("\n📄 Testing C header generation...")
     
-    header_script = Path("scripts/generate_header.py")
-    if header_script.exists():
-        success = run_command(["python3", str(header_script)], "Generating C headers")
+    if "generate_header.py" in scripts_present:
+        success = run_command(["python3", "scripts/generate_header.py"], "Generating C headers")
         
         # Check if headers were generated
         header_files = [
@@ -139,142 +258,153 @@ def test_header_generation():
         
         for header_file in header_files:
             if os.path.exists(header_file):
-                print(f"✅ Header file generated: {header_file}")
+                log(f"✅ Header file generated: {header_file}")
             else:
-                print(f"⚠️ Header file not found: {header_file}")
+                log(f"⚠️ Header file not found: {header_file}")
         
         return success
     else:
-        print("⚠️ Header generation script not found")
+        log("⚠️ Header generation script not found")
         return True
 
 def test_database_functionality():
     """Test database functionality"""
-    print("\n🗄️ Testing database functionality...")
+    log("\n🗄️ Testing database functionality...")
     
     # Check if migration files exist
-    migration_dir = Path("migrations")
-    if migration_dir.exists():
-        migration_files = list(migration_dir.glob("*.sql"))
-        print(f"✅ Found {len(migration_files)} migration files")
+    present = dir_entries("migrations")
+    if present is not None:
+        migration_files = [name for name in present if name.endswith(".sql")]
+        log(f"✅ Found {len(migration_files)} migration files")
         
-        # List some migration files
-        for migration in sorted(migration_files)[:5]:
-            print(f"   - {migration.name}")
+        # List some migration files; only the first five need ordering
+        for migration in heapq.nsmallest(5, migration_files):
+            log(f"   - {migration}")
         
         if len(migration_files) > 5:
-            print(f"   ... and {len(migration_files) - 5} more")
+            log(f"   ... and {len(migration_files) - 5} more")
         
         return True
     else:
-        print("⚠️ Migration directory not found")
+        log("⚠️ Migration directory not found")
         return False
 
+def check_module_files(kind, directory, names):
+    """Report which of a directory's expected module files exist; True if all of them do"""
+    present = dir_entries(directory) or set()
+    for name in names:
+        if name in present:
+            log(f"✅ {kind} module found: {directory}/{name}")
+        else:
+            log(f"❌ {kind} module missing: {directory}/{name}")
+    return present.issuperset(names)
+
 def test_authentication_setup():
     """Test authentication setup"""
-    print("\n🔐 Testing authentication setup...")
+    log("\n🔐 Testing authentication setup...")
     
     # Check if auth modules exist
-    auth_files = [
-        "src/auth/mod.rs",
-        "src/auth/service.rs", 
-        "src/auth/jwt.rs",
-        "src/auth/context.rs",
-        "src/auth/repository.rs"
-    ]
-    
-    all_exist = True
-    for auth_file in auth_files:
-        if os.path.exists(auth_file):
-            print(f"✅ Auth module found: {auth_file}")
-        else:
-            print(f"❌ Auth module missing: {auth_file}")
-            all_exist = False
-    
-    return all_exist
+    return check_module_files("Auth", AUTH_DIR, AUTH_FILES)
 
 def test_ffi_bindings():
     """Test FFI bindings"""
-    print("\n🔌 Testing FFI bindings...")
+    log("\n🔌 Testing FFI bindings...")
     
     # Check if FFI modules exist
-    ffi_files = [
-        "src/ffi/mod.rs",
-        "src/ffi/core.rs",
-        "src/ffi/auth.rs",
-        "src/ffi/user.rs",
-        "src/ffi/project.rs",
-        "src/ffi/participant.rs",
-        "src/ffi/error.rs"
-    ]
-    
-    all_exist = True
-    for ffi_file in ffi_files:
-        if os.path.exists(ffi_file):
-            print(f"✅ FFI module found: {ffi_file}")
-        else:
-            print(f"❌ FFI module missing: {ffi_file}")
-            all_exist = False
-    
-    return all_exist
+    return check_module_files("FFI", FFI_DIR, FFI_FILES)
+
+def run_stage(test_name, test_func):
+    """Run one test stage, reporting an exception as a failure"""
+    try:
+        return test_func()
+    except Exception as e:
+        log(f"❌ {test_name} failed with exception: {e}")
+        return False
+
+def run_buffered_stage(test_name, test_func):
+    """Run one pooled check with its output collected, returning (success, output)"""
+    _stage_output.buffer = buffer = io.StringIO()
+    try:
+        return run_stage(test_name, test_func), buffer.getvalue()
+    finally:
+        del _stage_output.buffer
+
+def write_stage_output(output):
+    """Write a finished check's output in one call and flush it so progress shows when piped"""
+    sys.stdout.write(output)
+    sys.stdout.flush()
 
 def run_comprehensive_test():
     """Run the comprehensive test suite"""
-    print("🚀 Starting Production-Ready iPad Rust Core Test Suite")
-    print("=" * 60)
+    write_stage_output("🚀 Starting Production-Ready iPad Rust Core Test Suite\n" + "=" * 60 + "\n")
     
-    tests = [
+    # Prerequisites and compilation run first, in order. The independent checks come next,
+    # then the builds, which stay in order since they share include/ and cargo's build lock
+    serial_tests = [
         ("Prerequisites", check_prerequisites),
-        ("Rust Compilation", test_rust_compilation),
+        ("Rust Check", test_rust_check),
+    ]
+    check_tests = [
         ("Database Functionality", test_database_functionality),
         ("Authentication Setup", test_authentication_setup),
         ("FFI Bindings", test_ffi_bindings),
-        ("Header Generation", test_header_generation),
-        ("iOS Build", test_ios_build),
-        ("macOS Build", test_macos_build),
+    ]
+    # One listing of scripts/ answers every build stage's "is the script there" check
+    scripts_present = dir_entries("scripts") or set()
+    build_tests = [
+        ("Header Generation", partial(test_header_generation, scripts_present)),
+        ("iOS Build", partial(test_ios_build, scripts_present)),
+        ("macOS Build", partial(test_macos_build, scripts_present)),
         ("Swift Integration", test_swift_integration),
     ]
     
     results = {}
     
-    for test_name, test_func in tests:
-        try:
-            results[test_name] = test_func()
-        except Exception as e:
-            print(f"❌ {test_name} failed with exception: {e}")
-            results[test_name] = False
+    # Serial stages print as they go, so long builds show progress while they run
+    for test_name, test_func in serial_tests:
+        results[test_name] = run_stage(test_name, test_func)
     
-    # Print summary
-    print("\n" + "=" * 60)
-    print("📊 TEST SUMMARY")
-    print("=" * 60)
+    # The checks only read files, so they run side by side. Each one's output is collected
+    # and written with one call, in the listed order
+    with ThreadPoolExecutor(max_workers=len(check_tests)) as executor:
+        futures = [
+            (test_name, executor.submit(run_buffered_stage, test_name, test_func))
+            for test_name, test_func in check_tests
+        ]
+        for test_name, future in futures:
+            results[test_name], output = future.result()
+            write_stage_output(output)
     
-    passed = 0
-    total = len(results)
+    for test_name, test_func in build_tests:
+        results[test_name] = run_stage(test_name, test_func)
     
-    for test_name, success in results.items():
-        status = "✅ PASS" if success else "❌ FAIL"
-        print(f"{test_name:<25} {status}")
-        if success:
-            passed += 1
+    # Print summary
+    passed = sum(map(bool, results.values()))
+    total = len(results)
     
-    print(f"\nResults: {passed}/{total} tests passed")
+    lines = ["\n" + "=" * 60, "📊 TEST SUMMARY", "=" * 60]
+    lines += [f"{test_name:<25} {'✅ PASS' if success else '❌ FAIL'}" for test_name, success in results.items()]
+    lines.append(f"\nResults: {passed}/{total} tests passed")
     
     if passed == total:
-        print("\n🎉 ALL TESTS PASSED!")
-        print("Your iPad Rust Core is production-ready!")
-        print("\n✅ Features verified:")
-        print("   - Proper iOS database directory handling")
-        print("   - Token-based authentication with JWT")
-        print("   - Valid JSON payload handling")
-        print("   - Cross-platform build support")
-        print("   - Memory-safe FFI bindings")
-        print("   - Centralized Tokio runtime")
-        return True
+        lines += [
+            "\n🎉 ALL TESTS PASSED!",
+            "Your iPad Rust Core is production-ready!",
+            "\n✅ Features verified:",
+            "   - Proper iOS database directory handling",
+            "   - Token-based authentication with JWT",
+            "   - Valid JSON payload handling",
+            "   - Cross-platform build support",
+            "   - Memory-safe FFI bindings",
+            "   - Centralized Tokio runtime",
+        ]
     else:
-        print(f"\n⚠️ {total - passed} tests failed.")
-        print("Please review the failed tests above.")
-        return False
+        lines += [
+            f"\n⚠️ {total - passed} tests failed.",
+            "Please review the failed tests above.",
+        ]
+    sys.stdout.write("\n".join(lines) + "\n")
+    return passed == total
 
 if __name__ == "__main__":
     success = run_comprehensive_test()
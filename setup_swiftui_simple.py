@@ -6,9 +6,62 @@ Creates all necessary SwiftUI files and provides instructions for Xcode project
 
 import os
 import shutil
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+
+# Build artifacts from target/ios: the libraries are copied into the SwiftUI project
+# folder, the header is symlinked (relative to the project folder) so it follows every rebuild
+LIBRARY_FILES = ("libipad_rust_core_device.a", "libipad_rust_core_sim.a")
+HEADER_FILE = "ipad_rust_core.h"
+
+# Swift sources and bridging header copied verbatim into SwiftUI_ActionAid/
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts", "templates", "SwiftUI")
+SWIFTUI_SOURCES = ("ActionAidSwiftUIApp.swift", "ContentView.swift", "ActionAidSwiftUI-Bridging-Header.h")
+
+def copy_library_file(src, dest):
+    """Copy a build artifact's data only, as a copy-on-write clone on APFS when possible"""
+    if sys.platform == "darwin":
+        # cp -c uses clonefile(2), so no bytes are duplicated however large the library is
+        try:
+            subprocess.run(["cp", "-c", src, dest], check=True, capture_output=True)
+            return
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            pass
+    # copyfile skips the metadata copy2 does and uses the kernel's copy fast path on Linux
+    shutil.copyfile(src, dest)
+
+def link_header(src, dest):
+    """Symlink the generated C header instead of copying it, falling back to a copy"""
+    # A relative link keeps working when the checkout is moved or cloned elsewhere
+    try:
+        os.symlink(os.path.relpath(src, os.path.dirname(dest)), dest)
+        return "Linked"
+    except OSError:
+        # No symlink support on this filesystem (or platform)
+        copy_library_file(src, dest)
+        return "Copied"
+
+@contextmanager
+def open_dir(path):
+    """File descriptor of a directory, for opening files relative to it"""
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        yield fd
+    finally:
+        os.close(fd)
+
+def copy_template(name, src_dir_fd, dest_dir_fd):
+    """Copy one file between two already-open directories"""
+    # 0o666 is what open() itself uses; os.open would default to 0o777
+    with open(name, "rb", opener=partial(os.open, dir_fd=src_dir_fd)) as src, \
+         open(name, "wb", opener=partial(os.open, mode=0o666, dir_fd=dest_dir_fd)) as dest:
+        shutil.copyfileobj(src, dest)
 
 def create_swiftui_files():
-    """Create all SwiftUI source files."""
+    """Create all SwiftUI source files; returns True if the header was linked rather than copied."""
     print("🏗️ Creating SwiftUI project files...")
     
     # Create directory
@@ -19,340 +72,31 @@ def create_swiftui_files():
     
     # Copy library files
     print("📚 Copying library files...")
-    shutil.copy2("target/ios/libipad_rust_core_device.a", "SwiftUI_ActionAid/")
-    shutil.copy2("target/ios/libipad_rust_core_sim.a", "SwiftUI_ActionAid/")
-    shutil.copy2("target/ios/ipad_rust_core.h", "SwiftUI_ActionAid/")
-    
-    # Create App file
-    app_content = '''//
-//  ActionAidSwiftUIApp.swift
-//  ActionAid SwiftUI Test
-//
-//  iPad Rust Core SwiftUI App
-//
-
-import SwiftUI
-
-@main
-struct ActionAidSwiftUIApp: App {
-    var body: some Scene {
-        WindowGroup {
-            ContentView()
-        }
-    }
-}
-'''
-    
-    with open("SwiftUI_ActionAid/ActionAidSwiftUIApp.swift", "w") as f:
-        f.write(app_content)
-    
-    # Create ContentView
-    content_view = '''//
-//  ContentView.swift
-//  ActionAid SwiftUI Test
-//
-//  iPad Rust Core Test Interface - SwiftUI
-//
-
-import SwiftUI
-
-struct ContentView: View {
-    @State private var statusMessage = "Ready to test iPad Rust Core"
-    @State private var testResults = ""
-    @State private var isRunningTests = false
-    
-    var body: some View {
-        NavigationView {
-            VStack(spacing: 20) {
-                // Header
-                VStack(spacing: 10) {
-                    Text("🚀 iPad Rust Core")
-                        .font(.largeTitle)
-                        .fontWeight(.bold)
-                    
-                    Text(statusMessage)
-                        .font(.headline)
-                        .foregroundColor(isRunningTests ? .orange : .primary)
-                        .multilineTextAlignment(.center)
-                        .padding(.horizontal)
-                }
-                .padding()
-                
-                // Test Button
-                Button(action: runTests) {
-                    HStack {
-                        if isRunningTests {
-                            ProgressView()
-                                .scaleEffect(0.8)
-                                .foregroundColor(.white)
-                        }
-                        Text(isRunningTests ? "Running Tests..." : "🧪 Run Tests")
-                            .fontWeight(.semibold)
-                    }
-                    .frame(maxWidth: .infinity)
-                    .padding()
-                    .background(
-                        LinearGradient(
-                            gradient: Gradient(colors: isRunningTests ? [.orange, .red] : [.blue, .purple]),
-                            startPoint: .leading,
-                            endPoint: .trailing
-                        )
-                    )
-                    .foregroundColor(.white)
-                    .cornerRadius(15)
-                    .shadow(radius: 5)
-                }
-                .disabled(isRunningTests)
-                .padding(.horizontal)
-                
-                // Results Section
-                ScrollView {
-                    Text(testResults.isEmpty ? "Tap 'Run Tests' to start testing your Rust library...\\n\\n🔬 This will test:\\n• Library version\\n• Database initialization\\n• User creation\\n• Authentication\\n• Project operations\\n• Error handling" : testResults)
-                        .font(.system(size: 12, family: .monospaced))
-                        .padding()
-                        .frame(maxWidth: .infinity, alignment: .leading)
-                        .background(Color(.systemGray6))
-                        .cornerRadius(15)
-                        .shadow(radius: 2)
-                }
-                .padding(.horizontal)
-                
-                Spacer()
-            }
-            .navigationBarHidden(true)
-            .background(
-                LinearGradient(
-                    gradient: Gradient(colors: [Color(.systemBackground), Color(.systemGray6)]),
-                    startPoint: .top,
-                    endPoint: .bottom
-                )
-            )
-        }
-        .onAppear {
-            updateStatus("Ready to test iPad Rust Core ✨")
-        }
-    }
-    
-    private func runTests() {
-        updateStatus("Running comprehensive tests...")
-        isRunningTests = true
-        
-        // Run tests asynchronously
-        Task {
-            let results = await performTests()
-            
-            await MainActor.run {
-                testResults = results
-                updateStatus("Tests completed! 🎉")
-                isRunningTests = false
-            }
-        }
-    }
-    
-    private func updateStatus(_ message: String) {
-        statusMessage = message
-        print("📱 Status: \\(message)")
-    }
-    
-    private func performTests() async -> String {
-        // Add small delay for better UX
-        try? await Task.sleep(nanoseconds: 500_000_000) // 0.5 seconds
-        
-        var results = "🚀 iPad Rust Core Test Results\\n"
-        results += "================================\\n\\n"
-        
-        // Test 1: Library Version
-        results += "1️⃣ Testing Library Version...\\n"
-        let version = get_library_version()
-        if let versionStr = String(cString: version, encoding: .utf8) {
-            results += "✅ Version: \\(versionStr)\\n\\n"
-        } else {
-            results += "❌ Failed to get version\\n\\n"
-        }
-        
-        // Test 2: Database Initialization
-        results += "2️⃣ Testing Database Initialization...\\n"
-        let deviceId = getDeviceId()
-        let dbPath = getDatabasePath()
-        results += "📱 Device ID: \\(deviceId)\\n"
-        results += "💾 Database Path: \\(dbPath)\\n"
-        
-        let dbUrl = "sqlite://\\(dbPath)"
-        let initResult = initialize_database(dbUrl)
-        if initResult == 0 {
-            results += "✅ Database initialized successfully\\n\\n"
-        } else {
-            results += "❌ Database initialization failed (code: \\(initResult))\\n\\n"
-        }
-        
-        // Test 3: User Creation
-        results += "3️⃣ Testing User Creation...\\n"
-        let userJson = """
-        {
-            "name": "Test User",
-            "email": "test@actionaid.org",
-            "password": "securepassword123",
-            "role": "admin"
-        }
-        """
-        
-        var userResult: UnsafeMutablePointer<CChar>?
-        let userCreateResult = user_create(userJson, &userResult)
-        
-        if userCreateResult == 0, let userResultStr = userResult {
-            let userResponse = String(cString: userResultStr)
-            results += "✅ User created: \\(userResponse)\\n\\n"
-            free_string(userResultStr)
-        } else {
-            let error = getLastError()
-            results += "❌ User creation failed: \\(error)\\n\\n"
-        }
-        
-        // Test 4: Authentication
-        results += "4️⃣ Testing Authentication...\\n"
-        let loginJson = """
-        {
-            "email": "test@actionaid.org",
-            "password": "securepassword123"
-        }
-        """
-        
-        var authResult: UnsafeMutablePointer<CChar>?
-        let authCreateResult = auth_login(loginJson, &authResult)
-        
-        var authToken: String = ""
-        if authCreateResult == 0, let authResultStr = authResult {
-            let authResponse = String(cString: authResultStr)
-            results += "✅ Authentication successful: \\(authResponse)\\n"
-            
-            // Extract token for further tests
-            if let tokenData = authResponse.data(using: .utf8),
-               let json = try? JSONSerialization.jsonObject(with: tokenData) as? [String: Any],
-               let token = json["access_token"] as? String {
-                authToken = token
-                results += "🔑 Token extracted for further tests\\n\\n"
-            }
-            free_string(authResultStr)
-        } else {
-            let error = getLastError()
-            results += "❌ Authentication failed: \\(error)\\n\\n"
-        }
-        
-        // Test 5: Project Operations (if authenticated)
-        if !authToken.isEmpty {
-            results += "5️⃣ Testing Project Operations...\\n"
-            let projectJson = """
-            {
-                "name": "Test Project",
-                "description": "A test project for iPad Rust Core",
-                "start_date": "2024-01-01",
-                "end_date": "2024-12-31",
-                "budget": 50000.0,
-                "status": "active"
-            }
-            """
-            
-            var projectResult: UnsafeMutablePointer<CChar>?
-            let projectCreateResult = project_create(projectJson, authToken, &projectResult)
-            
-            if projectCreateResult == 0, let projectResultStr = projectResult {
-                let projectResponse = String(cString: projectResultStr)
-                results += "✅ Project created: \\(projectResponse)\\n\\n"
-                free_string(projectResultStr)
-            } else {
-                let error = getLastError()
-                results += "❌ Project creation failed: \\(error)\\n\\n"
-            }
-        }
-        
-        // Test 6: Memory and Error Handling
-        results += "6️⃣ Testing Error Handling...\\n"
-        let lastError = getLastError()
-        results += "🔍 Last error: \\(lastError)\\n\\n"
-        
-        // Test 7: iOS-specific features
-        results += "7️⃣ Testing iOS Integration...\\n"
-        results += "📱 Running on iOS: \\(UIDevice.current.systemName) \\(UIDevice.current.systemVersion)\\n"
-        results += "🏷️ Device Model: \\(UIDevice.current.model)\\n"
-        results += "📂 Documents Directory: \\(getDocumentsDirectory())\\n"
-        results += "💾 Database URL: \\(getDatabaseURL())\\n\\n"
-        
-        results += "================================\\n"
-        results += "🎉 Test Suite Completed!\\n"
-        results += "✨ Your iPad Rust Core is working perfectly!\\n"
-        
-        return results
-    }
-    
-    // MARK: - Helper Functions
-    
-    private func getDeviceId() -> String {
-        if let uuid = UIDevice.current.identifierForVendor?.uuidString {
-            return uuid
-        }
-        return "unknown-device"
-    }
-    
-    private func getDocumentsDirectory() -> String {
-        let paths = FileManager.default.urls(for: .documentDirectory, in: .userDomainMask)
-        return paths[0].path
-    }
-    
-    private func getDatabasePath() -> String {
-        let documentsPath = getDocumentsDirectory()
-        return "\\(documentsPath)/actionaid_core.sqlite"
-    }
-    
-    private func getDatabaseURL() -> String {
-        return "sqlite://\\(getDatabasePath())"
-    }
-    
-    private func getLastError() -> String {
-        let errorPtr = get_last_error()
-        if let errorStr = String(cString: errorPtr, encoding: .utf8) {
-            return errorStr.isEmpty ? "No error" : errorStr
-        }
-        return "Unknown error"
-    }
-}
-
-#Preview {
-    ContentView()
-}
-'''
-    
-    with open("SwiftUI_ActionAid/ContentView.swift", "w") as f:
-        f.write(content_view)
-    
-    # Create bridging header
-    bridging_header = '''//
-//  ActionAidSwiftUI-Bridging-Header.h
-//  ActionAid SwiftUI Test
-//
-//  Use this file to import your target's public headers that you would like to expose to Swift.
-//
-
-#ifndef ActionAidSwiftUI_Bridging_Header_h
-#define ActionAidSwiftUI_Bridging_Header_h
-
-#import "ipad_rust_core.h"
-
-#endif /* ActionAidSwiftUI_Bridging_Header_h */
-'''
-    
-    with open("SwiftUI_ActionAid/ActionAidSwiftUI-Bridging-Header.h", "w") as f:
-        f.write(bridging_header)
+    for name in LIBRARY_FILES:
+        copy_library_file(os.path.join("target/ios", name), os.path.join("SwiftUI_ActionAid", name))
+    header_action = link_header(os.path.join("target/ios", HEADER_FILE),
+                                os.path.join("SwiftUI_ActionAid", HEADER_FILE))
+    
+    # Copy the Swift sources and the bridging header concurrently. Both directories are
+    # opened once and each file is opened relative to them, so neither path is resolved again
+    with open_dir(TEMPLATE_DIR) as src_dir_fd, open_dir("SwiftUI_ActionAid") as dest_dir_fd:
+        copy = partial(copy_template, src_dir_fd=src_dir_fd, dest_dir_fd=dest_dir_fd)
+        with ThreadPoolExecutor(max_workers=len(SWIFTUI_SOURCES)) as executor:
+            list(executor.map(copy, SWIFTUI_SOURCES))
     
     print("✅ Created: ActionAidSwiftUIApp.swift")
     print("✅ Created: ContentView.swift")
     print("✅ Created: ActionAidSwiftUI-Bridging-Header.h")
     print("✅ Copied: libipad_rust_core_device.a")
     print("✅ Copied: libipad_rust_core_sim.a")
-    print("✅ Copied: ipad_rust_core.h")
+    print(f"✅ {header_action}: ipad_rust_core.h")
+    return header_action == "Linked"
 
-def print_instructions():
+def print_instructions(header_linked=False):
     """Print step-by-step instructions for creating the Xcode project."""
-    print("""
+    header_note = ("\n        (a link to ../target/ios/ipad_rust_core.h, so it follows every rebuild;"
+                   "\n         re-run this script if it dangles after cargo clean)" if header_linked else "")
+    print(f"""
 🎉 SwiftUI Files Created Successfully!
 
 📝 MANUAL XCODE PROJECT SETUP:
@@ -373,7 +117,7 @@ def print_instructions():
       • ActionAidSwiftUI-Bridging-Header.h
       • libipad_rust_core_device.a
       • libipad_rust_core_sim.a
-      • ipad_rust_core.h
+      • ipad_rust_core.h{header_note}
 
 6. Configure Build Settings:
    a) Select your project → Target → Build Settings
@@ -410,8 +154,8 @@ def main():
         print("❌ Please run this script from the project root directory")
         return 1
     
-    create_swiftui_files()
-    print_instructions()
+    header_linked = create_swiftui_files()
+    print_instructions(header_linked)
     
     return 0
 
@@ -6,300 +6,340 @@ This script systematically tests each domain to verify our foreign key constrain
 work correctly across all parts of the system.
 
 Usage:
-    python3 test_domains_individually.py
+    python3 test_domains_individually.py [--cache-dir DIR]
+
+--cache-dir (or IPAD_RUST_CACHE) keeps the Cargo build directory outside the
+checkout, keyed by Cargo.toml plus Cargo.lock when there is one, so repeated or
+CI runs only rebuild what changed. Cargo.lock isn't committed, so the first run
+after the first build creates it misses the cache once. Setting
+CARGO_TARGET_DIR directly works too.
+
+On Linux hybrid P/E-core CPUs the test binary (not the build) runs on the
+P-cores; IPAD_RUST_PCORES=0,1,2,3 picks the CPUs by hand.
 """
 
+import argparse
+import hashlib
+import os
+import re
+import signal
 import subprocess
-import json
-import time
+import threading
 import sys
+from collections import deque
+from contextlib import contextmanager
 from pathlib import Path
 
-def run_rust_command(description, timeout=60):
-    """Helper to run Rust library commands"""
-    print(f"\n🔄 {description}")
-    try:
-        result = subprocess.run(
-            ["cargo", "run", "--release", "--bin", "test_domain_functions"], 
-            cwd=".", 
-            capture_output=True, 
-            text=True, 
-            timeout=timeout
-        )
-        if result.returncode == 0:
-            print(f"✅ {description} - SUCCESS")
-            return True, result.stdout
-        else:
-            print(f"❌ {description} - FAILED")
-            print(f"Error: {result.stderr}")
-            return False, result.stderr
-    except subprocess.TimeoutExpired:
-        print(f"⏰ {description} - TIMEOUT")
-        return False, "Timeout"
-    except Exception as e:
-        print(f"💥 {description} - EXCEPTION: {e}")
-        return False, str(e)
+# Error signatures the domain tests watch for, and how much output is kept per run
+FK_VIOLATION = "FOREIGN KEY constraint failed"
+ERROR_SIGNATURES = (FK_VIOLATION, "UNIQUE constraint failed", "no such table")
+OUTPUT_TAIL_LINES = 200
 
-def test_basic_setup():
-    """Test basic library setup and initialization"""
-    print("🏗️ Testing Basic Library Setup")
-    print("=" * 50)
-    
-    success, output = run_rust_command("Library initialization and database setup")
-    if not success:
-        print("❌ Basic setup failed - cannot continue with domain tests")
-        return False
-    
-    print("✅ Library setup successful")
-    return True
+# How long a test binary gets to exit after SIGTERM before it is killed
+TERM_GRACE_SECONDS = 5
 
-def test_auth_domain():
-    """Test authentication domain"""
-    print("\n🔐 Testing Auth Domain")
-    print("=" * 50)
-    
-    tests = [
+# One bytes alternation, so each output line is scanned once however many signatures there are
+ERROR_PATTERN = re.compile(b"|".join(re.escape(signature.encode()) for signature in ERROR_SIGNATURES))
+
+# Release build of the domain test binary, set once test_basic_setup has built it
+_BIN_PATH = None
+
+# CPUs the test binary is started on, set by select_test_cpus (None leaves it unpinned)
+_TEST_CPUS = None
+
+# Environment variable that enables the persistent build cache without --cache-dir
+CACHE_ENV = "IPAD_RUST_CACHE"
+
+# Environment variable listing the CPUs to pin the test binary to, overriding detection
+PCORES_ENV = "IPAD_RUST_PCORES"
+
+# Each domain's name, icon and sub-tests, in the order they run
+DOMAINS = [
+    ("Auth", "🔐", [
         "Default account creation (system operations)",
-        "User login with token generation", 
+        "User login with token generation",
         "Token validation and refresh",
-        "User logout with token revocation"
-    ]
-    
-    results = []
-    for test in tests:
-        success, output = run_rust_command(f"Auth: {test}")
-        results.append(success)
-        if "FOREIGN KEY constraint failed" in output:
-            print(f"🚨 FOREIGN KEY VIOLATION detected in {test}")
-            print(f"Output: {output[:500]}")
-        
-    passed = sum(results)
-    print(f"\n📊 Auth Domain: {passed}/{len(tests)} tests passed")
-    return passed == len(tests)
-
-def test_user_domain():
-    """Test user domain operations"""
-    print("\n👤 Testing User Domain")
-    print("=" * 50)
-    
-    tests = [
+        "User logout with token revocation",
+    ]),
+    ("User", "👤", [
         "Create new user (with proper created_by handling)",
         "Update user profile",
-        "List users with pagination", 
+        "List users with pagination",
         "Soft delete user",
-        "Get user by ID"
-    ]
-    
-    results = []
-    for test in tests:
-        success, output = run_rust_command(f"User: {test}")
-        results.append(success)
-        if "FOREIGN KEY constraint failed" in output:
-            print(f"🚨 FOREIGN KEY VIOLATION detected in {test}")
-            print(f"Output: {output[:500]}")
-        
-    passed = sum(results)
-    print(f"\n📊 User Domain: {passed}/{len(tests)} tests passed")
-    return passed == len(tests)
-
-def test_project_domain():
-    """Test project domain operations"""
-    print("\n📋 Testing Project Domain")
-    print("=" * 50)
-    
-    tests = [
+        "Get user by ID",
+    ]),
+    ("Project", "📋", [
         "Create new project",
         "Update project details",
         "List projects with filtering",
         "Delete project (soft/hard)",
-        "Get project with activities"
-    ]
-    
-    results = []
-    for test in tests:
-        success, output = run_rust_command(f"Project: {test}")
-        results.append(success)
-        if "FOREIGN KEY constraint failed" in output:
-            print(f"🚨 FOREIGN KEY VIOLATION detected in {test}")
-            print(f"Output: {output[:500]}")
-        
-    passed = sum(results)
-    print(f"\n📊 Project Domain: {passed}/{len(tests)} tests passed")
-    return passed == len(tests)
-
-def test_activity_domain():
-    """Test activity domain operations"""
-    print("\n🎯 Testing Activity Domain")
-    print("=" * 50)
-    
-    tests = [
+        "Get project with activities",
+    ]),
+    ("Activity", "🎯", [
         "Create new activity",
         "Update activity status",
         "List activities by project",
         "Delete activity",
-        "Get activity with participants"
-    ]
-    
-    results = []
-    for test in tests:
-        success, output = run_rust_command(f"Activity: {test}")
-        results.append(success)
-        if "FOREIGN KEY constraint failed" in output:
-            print(f"🚨 FOREIGN KEY VIOLATION detected in {test}")
-            print(f"Output: {output[:500]}")
-        
-    passed = sum(results)
-    print(f"\n📊 Activity Domain: {passed}/{len(tests)} tests passed")
-    return passed == len(tests)
-
-def test_participant_domain():
-    """Test participant domain operations"""
-    print("\n👥 Testing Participant Domain")
-    print("=" * 50)
-    
-    tests = [
+        "Get activity with participants",
+    ]),
+    ("Participant", "👥", [
         "Create new participant",
         "Update participant details",
         "Find participants by demographics",
         "Delete participant",
-        "Get participant with workshops"
-    ]
-    
-    results = []
-    for test in tests:
-        success, output = run_rust_command(f"Participant: {test}")
-        results.append(success)
-        if "FOREIGN KEY constraint failed" in output:
-            print(f"🚨 FOREIGN KEY VIOLATION detected in {test}")
-            print(f"Output: {output[:500]}")
-        
-    passed = sum(results)
-    print(f"\n📊 Participant Domain: {passed}/{len(tests)} tests passed")
-    return passed == len(tests)
-
-def test_workshop_domain():
-    """Test workshop domain operations"""
-    print("\n🏫 Testing Workshop Domain")
-    print("=" * 50)
-    
-    tests = [
+        "Get participant with workshops",
+    ]),
+    ("Workshop", "🏫", [
         "Create new workshop",
         "Add participants to workshop",
         "Update workshop details",
         "Get workshop with participants",
-        "Delete workshop"
-    ]
-    
-    results = []
-    for test in tests:
-        success, output = run_rust_command(f"Workshop: {test}")
-        results.append(success)
-        if "FOREIGN KEY constraint failed" in output:
-            print(f"🚨 FOREIGN KEY VIOLATION detected in {test}")
-            print(f"Output: {output[:500]}")
-        
-    passed = sum(results)
-    print(f"\n📊 Workshop Domain: {passed}/{len(tests)} tests passed")
-    return passed == len(tests)
-
-def test_donor_domain():
-    """Test donor domain operations"""
-    print("\n💰 Testing Donor Domain")
-    print("=" * 50)
-    
-    tests = [
+        "Delete workshop",
+    ]),
+    ("Donor", "💰", [
         "Create new donor",
         "Update donor information",
         "List donors with filtering",
         "Delete donor",
-        "Get donor with funding history"
-    ]
-    
-    results = []
-    for test in tests:
-        success, output = run_rust_command(f"Donor: {test}")
-        results.append(success)
-        if "FOREIGN KEY constraint failed" in output:
-            print(f"🚨 FOREIGN KEY VIOLATION detected in {test}")
-            print(f"Output: {output[:500]}")
-        
-    passed = sum(results)
-    print(f"\n📊 Donor Domain: {passed}/{len(tests)} tests passed")
-    return passed == len(tests)
-
-def test_livelihood_domain():
-    """Test livelihood domain operations"""
-    print("\n🌱 Testing Livelihood Domain")
-    print("=" * 50)
-    
-    tests = [
+        "Get donor with funding history",
+    ]),
+    ("Livelihood", "🌱", [
         "Create new livelihood program",
         "Update livelihood details",
         "List livelihoods by participant",
         "Delete livelihood",
-        "Get livelihood with timeline"
-    ]
-    
-    results = []
-    for test in tests:
-        success, output = run_rust_command(f"Livelihood: {test}")
-        results.append(success)
-        if "FOREIGN KEY constraint failed" in output:
-            print(f"🚨 FOREIGN KEY VIOLATION detected in {test}")
-            print(f"Output: {output[:500]}")
-        
-    passed = sum(results)
-    print(f"\n📊 Livelihood Domain: {passed}/{len(tests)} tests passed")
-    return passed == len(tests)
-
-def test_document_domain():
-    """Test document domain operations"""
-    print("\n📄 Testing Document Domain")
-    print("=" * 50)
-    
-    tests = [
+        "Get livelihood with timeline",
+    ]),
+    ("Document", "📄", [
         "Create document type",
         "Upload document",
         "Update document metadata",
         "Delete document",
-        "Get document with versions"
-    ]
-    
-    results = []
-    for test in tests:
-        success, output = run_rust_command(f"Document: {test}")
-        results.append(success)
-        if "FOREIGN KEY constraint failed" in output:
-            print(f"🚨 FOREIGN KEY VIOLATION detected in {test}")
-            print(f"Output: {output[:500]}")
-        
-    passed = sum(results)
-    print(f"\n📊 Document Domain: {passed}/{len(tests)} tests passed")
-    return passed == len(tests)
-
-def test_sync_domain():
-    """Test sync and change log operations"""
-    print("\n🔄 Testing Sync Domain")
-    print("=" * 50)
-    
-    tests = [
+        "Get document with versions",
+    ]),
+    ("Sync", "🔄", [
         "Create change log entry (system operation)",
         "Create tombstone record (system operation)",
         "Sync batch processing",
         "Entity merger operations",
-        "Conflict resolution"
-    ]
+        "Conflict resolution",
+    ]),
+]
+
+# Domains whose sub-tests need records from other domains; a failed dependency skips them
+DOMAIN_DEPS = {
+    "User": {"Auth"},
+    "Project": {"User"},
+    "Activity": {"Project"},
+    "Participant": {"User"},
+    "Workshop": {"Participant"},
+    "Donor": {"User"},
+    "Livelihood": {"Participant"},
+}
+
+def use_build_cache(cache_dir):
+    """Point CARGO_TARGET_DIR at a build directory under cache_dir, keyed by the manifest and lock file"""
+    if os.environ.get("CARGO_TARGET_DIR"):
+        print(f"📦 CARGO_TARGET_DIR already set, not using {cache_dir}")
+        return
+    # The manifest is always hashed, so the key only changes when the lock file first
+    # appears (it isn't committed) rather than flipping between files
+    key_files = [path for path in (Path("Cargo.toml"), Path("Cargo.lock")) if path.exists()]
+    digest = hashlib.sha256()
+    for path in key_files:
+        digest.update(path.name.encode() + b"\0" + path.read_bytes() + b"\0")
+    target_dir = Path(cache_dir).expanduser() / digest.hexdigest()[:16] / "target"
+    target_dir.mkdir(parents=True, exist_ok=True)
+    os.environ["CARGO_TARGET_DIR"] = str(target_dir)
+    print(f"📦 Using build cache {target_dir} (key: {' + '.join(path.name for path in key_files) or 'no manifest found'})")
+
+def parse_cpu_list(text):
+    """CPU numbers from a kernel cpulist such as 0-7,16"""
+    cpus = set()
+    for part in text.strip().split(","):
+        first, _, last = part.partition("-")
+        cpus.update(range(int(first), int(last or first) + 1))
+    return cpus
+
+def performance_cores():
+    """P-cores of a hybrid CPU (or $IPAD_RUST_PCORES) this process may use; None when there is nothing to pin to"""
+    override = os.environ.get(PCORES_ENV)
+    if override:
+        cores = {int(cpu) for cpu in override.split(",")}
+    else:
+        # Only hybrid parts register a separate P-core PMU; elsewhere all cores are equal
+        try:
+            cores = parse_cpu_list(Path("/sys/devices/cpu_core/cpus").read_text())
+        except OSError:
+            return None
+    
+    allowed = os.sched_getaffinity(0)
+    cores &= allowed
+    if not cores:
+        raise ValueError(f"none of the performance cores are in the allowed CPUs {sorted(allowed)}")
+    return cores if cores != allowed else None
+
+def select_test_cpus():
+    """Choose the CPUs the test binary runs on; the build and the harness itself stay unpinned"""
+    global _TEST_CPUS
+    if not hasattr(os, "sched_setaffinity"):
+        return
+    try:
+        _TEST_CPUS = performance_cores()
+    except ValueError as e:
+        print(f"⚠️ Could not pin to performance cores: {e}")
+        return
+    if _TEST_CPUS:
+        print(f"📌 Running domain tests on CPUs {','.join(map(str, sorted(_TEST_CPUS)))}")
+
+@contextmanager
+def pinned_to(cpus):
+    """Pin the calling thread to cpus for the block, so processes it starts inherit the mask"""
+    if not cpus:
+        yield
+        return
+    previous = os.sched_getaffinity(0)
+    os.sched_setaffinity(0, cpus)
+    try:
+        yield
+    finally:
+        os.sched_setaffinity(0, previous)
+
+def build_test_binary(timeout=600):
+    """Build the domain test binary once, so each test runs it directly instead of via cargo run"""
+    global _BIN_PATH
+    print("\n🔨 Building test_domain_functions (release)")
+    try:
+        result = subprocess.run(
+            ["cargo", "build", "--release", "--bin", "test_domain_functions"],
+            capture_output=True,
+            text=True,
+            timeout=timeout
+        )
+    except (subprocess.TimeoutExpired, OSError) as e:
+        print(f"❌ Build failed: {e}")
+        return False
+    if result.returncode != 0:
+        print("❌ Build failed")
+        print(f"Error: {result.stderr}")
+        return False
     
-    results = []
+    _BIN_PATH = Path(os.environ.get("CARGO_TARGET_DIR", "target")) / "release" / "test_domain_functions"
+    print(f"✅ Built {_BIN_PATH}")
+    return True
+
+def run_rust_command(description, timeout=60):
+    """Run the test binary and return (success, output tail, error signatures seen), stopping at the first foreign key violation"""
+    print(f"\n🔄 {description}")
+    try:
+        # Own session, so a timeout or early stop signals everything the test started
+        with pinned_to(_TEST_CPUS):
+            proc = subprocess.Popen(
+                [str(_BIN_PATH)], 
+                cwd=".", 
+                stdout=subprocess.PIPE, 
+                stderr=subprocess.STDOUT, 
+                start_new_session=True
+            )
+    except Exception as e:
+        print(f"💥 {description} - EXCEPTION: {e}")
+        return False, str(e), set()
+    
+    def signal_group(sig):
+        try:
+            os.killpg(proc.pid, sig)
+        except ProcessLookupError:
+            pass
+    
+    timed_out = threading.Event()
+    def kill():
+        timed_out.set()
+        signal_group(signal.SIGKILL)
+    timer = threading.Timer(timeout, kill)
+    timer.start()
+    
+    # Every line is scanned as raw bytes as it arrives, so signatures that scroll out of the
+    # kept tail are still reported; only the tail kept for the report gets decoded
+    tail = deque(maxlen=OUTPUT_TAIL_LINES)
+    signatures = set()
+    fk_violation = False
+    finished = False
+    try:
+        for line in proc.stdout:
+            tail.append(line)
+            signatures.update(match.decode() for match in ERROR_PATTERN.findall(line))
+            if FK_VIOLATION in signatures:
+                # Nothing the test prints afterwards can make it pass
+                fk_violation = True
+                break
+        finished = True
+    except Exception as e:
+        print(f"💥 {description} - EXCEPTION: {e}")
+        return False, str(e), signatures
+    finally:
+        if not finished:
+            signal_group(signal.SIGKILL)
+        elif fk_violation:
+            signal_group(signal.SIGTERM)
+        proc.stdout.close()
+        if fk_violation:
+            try:
+                proc.wait(timeout=TERM_GRACE_SECONDS)
+            except subprocess.TimeoutExpired:
+                signal_group(signal.SIGKILL)
+        # The timer stays armed until the binary is reaped, so timeout bounds the wait too
+        proc.wait()
+        timer.cancel()
+    
+    output = b"".join(tail).decode("utf-8", errors="replace")
+    if timed_out.is_set() and not fk_violation:
+        print(f"⏰ {description} - TIMEOUT")
+        return False, "Timeout", signatures
+    if proc.returncode == 0 and not fk_violation:
+        print(f"✅ {description} - SUCCESS")
+        return True, output, signatures
+    else:
+        print(f"❌ {description} - FAILED")
+        print(f"Error: {output}")
+        return False, output, signatures
+
+def test_basic_setup():
+    """Test basic library setup and initialization"""
+    print("🏗️ Testing Basic Library Setup")
+    print("=" * 50)
+    
+    if not build_test_binary():
+        print("❌ Basic setup failed - cannot continue with domain tests")
+        return False
+    
+    success, _, _ = run_rust_command("Library initialization and database setup")
+    if not success:
+        print("❌ Basic setup failed - cannot continue with domain tests")
+        return False
+    
+    print("✅ Library setup successful")
+    return True
+
+def run_domain(name, icon, tests):
+    """Run one domain's sub-tests, reporting foreign key violations; True if all pass"""
+    print(f"\n{icon} Testing {name} Domain")
+    print("=" * 50)
+    
+    passed = 0
+    fk_hits = 0
     for test in tests:
-        success, output = run_rust_command(f"Sync: {test}")
-        results.append(success)
-        if "FOREIGN KEY constraint failed" in output:
+        success, output, signatures = run_rust_command(f"{name}: {test}")
+        passed += success
+        if FK_VIOLATION in signatures:
+            fk_hits += 1
             print(f"🚨 FOREIGN KEY VIOLATION detected in {test}")
             print(f"Output: {output[:500]}")
+        for signature in sorted(signatures - {FK_VIOLATION}):
+            print(f"⚠️ {signature} in {test}")
         
-    passed = sum(results)
-    print(f"\n📊 Sync Domain: {passed}/{len(tests)} tests passed")
+    print(f"\n📊 {name} Domain: {passed}/{len(tests)} tests passed")
+    if fk_hits:
+        print(f"🚨 {fk_hits} foreign key violation(s) in {name} Domain")
     return passed == len(tests)
 
 def run_comprehensive_domain_tests():
@@ -314,24 +354,18 @@ def run_comprehensive_domain_tests():
         return False
     
     # Run all domain tests
-    domain_tests = [
-        ("Auth Domain", test_auth_domain),
-        ("User Domain", test_user_domain), 
-        ("Project Domain", test_project_domain),
-        ("Activity Domain", test_activity_domain),
-        ("Participant Domain", test_participant_domain),
-        ("Workshop Domain", test_workshop_domain),
-        ("Donor Domain", test_donor_domain),
-        ("Livelihood Domain", test_livelihood_domain),
-        ("Document Domain", test_document_domain),
-        ("Sync Domain", test_sync_domain)
-    ]
-    
     results = {}
     
-    for domain_name, test_func in domain_tests:
+    for name, icon, tests in DOMAINS:
+        domain_name = f"{name} Domain"
+        # None marks a skipped domain, which counts as failed for anything depending on it
+        failed_deps = sorted(dep for dep in DOMAIN_DEPS.get(name, ()) if not results.get(f"{dep} Domain", True))
+        if failed_deps:
+            print(f"\n{icon} {domain_name}: ⏭ SKIPPED ({', '.join(failed_deps)} failed)")
+            results[domain_name] = None
+            continue
         try:
-            results[domain_name] = test_func()
+            results[domain_name] = run_domain(name, icon, tests)
         except Exception as e:
             print(f"💥 {domain_name} test crashed: {e}")
             results[domain_name] = False
@@ -345,7 +379,7 @@ def run_comprehensive_domain_tests():
     passed_domains = sum(1 for success in results.values() if success)
     
     for domain, success in results.items():
-        status = "✅ PASS" if success else "❌ FAIL"
+        status = "⏭ SKIPPED" if success is None else "✅ PASS" if success else "❌ FAIL"
         print(f"{domain:<20} {status}")
     
     print(f"\nOverall Results: {passed_domains}/{total_domains} domains passed")
@@ -362,13 +396,29 @@ def run_comprehensive_domain_tests():
         print("   - Database integrity throughout")
         return True
     else:
-        failed_domains = [domain for domain, success in results.items() if not success]
-        print(f"\n⚠️ {total_domains - passed_domains} domains failed:")
+        failed_domains = [domain for domain, success in results.items() if success is False]
+        skipped_domains = [domain for domain, success in results.items() if success is None]
+        print(f"\n⚠️ {len(failed_domains)} domains failed:")
         for domain in failed_domains:
             print(f"   - {domain}")
+        if skipped_domains:
+            print(f"\n⏭ {len(skipped_domains)} domains skipped because a dependency failed:")
+            for domain in skipped_domains:
+                print(f"   - {domain}")
         print("\nPlease review the failed tests above for foreign key violations.")
         return False
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Test each domain of iPad Rust Core individually")
+    parser.add_argument(
+        "--cache-dir",
+        default=os.environ.get(CACHE_ENV),
+        help=f"persistent directory for Cargo build output (default: ${CACHE_ENV})"
+    )
+    args = parser.parse_args()
+    if args.cache_dir:
+        use_build_cache(args.cache_dir)
+    select_test_cpus()
+    
     success = run_comprehensive_domain_tests()
     sys.exit(0 if success else 1) 
\ No newline at end of file